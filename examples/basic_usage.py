@@ -17,8 +17,12 @@ store = OpenSearchStore.from_settings(
 store.setup()
 
 namespace = ("prefs", "user_123")
-store.put(namespace, "coding_style", {"text": "I enjoy typed Python", "source": "profile"})
-store.put(namespace, "favorite_stack", {"text": "Async FastAPI", "source": "profile"})
+store.put_many(
+    [
+        (namespace, "coding_style", {"text": "I enjoy typed Python", "source": "profile"}),
+        (namespace, "favorite_stack", {"text": "Async FastAPI", "source": "profile"}),
+    ]
+)
 
 print(store.get(namespace, "coding_style"))
 
@@ -1,5 +1,6 @@
 """Sketch of wiring the store into a LangGraph workflow."""
 
+import asyncio
 import uuid
 from typing import Any, Dict, Mapping
 
@@ -18,7 +19,9 @@ store = OpenSearchStore.from_settings(
 store.setup()
 
 
-def call_model(state: MessagesState, config: RunnableConfig, *, store=store) -> Dict[str, Any]:
+async def call_model(
+    state: MessagesState, config: RunnableConfig, *, store=store
+) -> Dict[str, Any]:
     configurable = config.get("configurable") or {}
     if not isinstance(configurable, Mapping):
         configurable = {}
@@ -26,15 +29,19 @@ def call_model(state: MessagesState, config: RunnableConfig, *, store=store) ->
     namespace = ("memories", user_id)
     last_entry = state["messages"][-1]
     last_message = str(last_entry.content)
-    memories = store.search(namespace, query=last_message, limit=2)
+    # Recall against the last few user turns with one `_msearch` round-trip.
+    recent = [str(m.content) for m in state["messages"][-3:] if m.type == "human"] or [last_message]
+    memories = {
+        m.key: m for batch in await store.asearch_batch(namespace, recent, limit=2) for m in batch
+    }.values()
     context = "\n".join(
         str(m.value.get("text")) for m in memories if isinstance(m.value, dict)
     ).strip()
 
     if "remember" in last_message.lower():
-        store.put(namespace, str(uuid.uuid4()), {"text": last_message})
+        await store.aput(namespace, str(uuid.uuid4()), {"text": last_message})
 
-    response = ChatOpenAI(model="gpt-4o-mini").invoke(
+    response = await ChatOpenAI(model="gpt-4o-mini").ainvoke(
         [
             {"role": "system", "content": f"You know: {context}" if context else "No prior info."},
             *state["messages"],
@@ -50,9 +57,18 @@ def build_graph() -> CompiledStateGraph:
     return builder.compile(store=store)
 
 
-if __name__ == "__main__":
+async def main() -> None:
     graph = build_graph()
     cfg = RunnableConfig(configurable={"thread_id": "t1", "user_id": "alice"})
-    graph.invoke({"messages": [{"role": "user", "content": "Remember that I love pizza"}]}, cfg)
-    result = graph.invoke({"messages": [{"role": "user", "content": "What do I like?"}]}, cfg)
+    await graph.ainvoke(
+        {"messages": [{"role": "user", "content": "Remember that I love pizza"}]}, cfg
+    )
+    result = await graph.ainvoke(
+        {"messages": [{"role": "user", "content": "What do I like?"}]}, cfg
+    )
     print(result["messages"][-1].content)
+    await store.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
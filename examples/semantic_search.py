@@ -14,7 +14,8 @@ store = OpenSearchStore.from_settings(settings=settings, embeddings=embeddings)
 store.setup()
 
 ns = ("memories", "user_456")
-store.put(ns, "1", {"text": "I love pizza"})
-store.put(ns, "2", {"text": "I am a plumber"})
+store.put_many([(ns, "1", {"text": "I love pizza"}), (ns, "2", {"text": "I am a plumber"})])
 
 print(store.search(ns, query="I'm hungry", limit=1))
+# Diversify results: over-fetch kNN candidates and re-rank with maximal marginal relevance.
+print(store.search(ns, query="What do I do and like?", limit=2, mmr_lambda=0.7))
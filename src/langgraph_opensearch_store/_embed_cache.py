@@ -0,0 +1,123 @@
+"""In-process LRU cache in front of a LangChain `Embeddings` provider."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """Memoize `embed_query`/`embed_documents` results keyed by a text digest.
+
+    Entries are evicted least-recently-used once `maxsize` is reached and, when
+    `ttl_seconds` is set, expire that long after they were computed. Vectors are
+    held as tuples and handed out as fresh lists, so callers may mutate them.
+    """
+
+    def __init__(
+        self,
+        base: Embeddings,
+        *,
+        maxsize: int = 10_000,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        self.base = base
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._model = _model_name(base).encode()
+        self._cache: OrderedDict[bytes, tuple[tuple[float, ...], float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._digest(b"q", text)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        vector = self.base.embed_query(text)
+        self._store(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> list[float]:
+        key = self._digest(b"q", text)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        vector = await self.base.aembed_query(text)
+        self._store(key, vector)
+        return vector
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, results, misses = self._partition(texts)
+        if not misses:
+            return results  # type: ignore[return-value]
+        return self._merge(keys, results, misses, self.base.embed_documents(list(misses.values())))
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, results, misses = self._partition(texts)
+        if not misses:
+            return results  # type: ignore[return-value]
+        fresh = await self.base.aembed_documents(list(misses.values()))
+        return self._merge(keys, results, misses, fresh)
+
+    def _partition(
+        self, texts: list[str]
+    ) -> tuple[list[bytes], list[list[float] | None], dict[bytes, str]]:
+        keys = [self._digest(b"d", text) for text in texts]
+        results = [self._lookup(key) for key in keys]
+        misses: dict[bytes, str] = {}
+        for key, text, cached in zip(keys, texts, results):
+            if cached is None:
+                misses.setdefault(key, text)
+        return keys, results, misses
+
+    def _merge(
+        self,
+        keys: list[bytes],
+        results: list[list[float] | None],
+        misses: dict[bytes, str],
+        vectors: list[list[float]],
+    ) -> list[list[float]]:
+        fresh = dict(zip(misses, vectors))
+        for key, vector in fresh.items():
+            self._store(key, vector)
+        return [
+            cached if cached is not None else list(fresh[key]) for key, cached in zip(keys, results)
+        ]
+
+    def _lookup(self, key: bytes) -> list[float] | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            vector, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return list(vector)
+
+    def _store(self, key: bytes, vector: list[float]) -> None:
+        expires_at = None if self.ttl_seconds is None else time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._cache[key] = (tuple(vector), expires_at)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def _digest(self, kind: bytes, text: str) -> bytes:
+        # Query and document vectors live in separate key spaces: some providers embed
+        # them with different instructions. The model name keeps swapped providers apart.
+        payload = kind + self._model + b"\0" + text.encode()
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _model_name(embeddings: Embeddings) -> str:
+    for attr in ("model", "model_name", "model_id"):
+        value = getattr(embeddings, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(embeddings).__qualname__
@@ -0,0 +1,43 @@
+"""Maximal marginal relevance re-ranking over embeddings returned with kNN hits."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def mmr_order(
+    query_vector: Sequence[float],
+    candidate_vectors: Sequence[Sequence[float]],
+    *,
+    lambda_mult: float,
+    k: int,
+) -> list[int]:
+    """Return up to `k` candidate indices in MMR order.
+
+    `lambda_mult=1.0` ranks by relevance only; lower values penalize candidates that
+    are similar to ones already selected.
+    """
+
+    if not candidate_vectors or k <= 0:
+        return []
+    matrix = _normalize(np.asarray(candidate_vectors, dtype=np.float32))
+    query = _normalize(np.asarray(query_vector, dtype=np.float32))
+    relevance = matrix @ query
+    redundancy = np.zeros(len(matrix), dtype=np.float32)
+    available = np.ones(len(matrix), dtype=bool)
+    selected: list[int] = []
+    for _ in range(min(k, len(matrix))):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, matrix @ matrix[best], out=redundancy)
+    return selected
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
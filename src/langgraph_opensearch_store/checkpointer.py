@@ -27,5 +27,11 @@ class OpenSearchCheckpointer:
 
     def promote_fact(self, namespace: Iterable[str], message: str) -> None:
         """Allow agents to copy ad-hoc strings into long-term storage."""
+        self.promote_facts(namespace, [message])
+
+    def promote_facts(self, namespace: Iterable[str], messages: Iterable[str]) -> None:
+        """Copy several strings into long-term storage with one bulk write."""
         tuple_namespace = tuple(namespace)
-        self.store.put(tuple_namespace, key=str(uuid.uuid4()), value={"text": message})
+        self.store.put_many(
+            (tuple_namespace, str(uuid.uuid4()), {"text": message}) for message in messages
+        )
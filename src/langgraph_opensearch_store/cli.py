@@ -9,6 +9,17 @@ import click
 
 from .store import OpenSearchStore
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def _dumps(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value, indent=2)
+
 
 def _comma_to_list(value: str | None) -> list[str] | None:
     if value is None:
@@ -37,13 +48,13 @@ def cli(ctx: click.Context, conn_str: str | None, **kwargs: Any) -> None:
 @cli.command()
 @click.pass_obj
 def health(store: OpenSearchStore) -> None:
-    click.echo(json.dumps(store.get_health(), indent=2))
+    click.echo(_dumps(store.get_health()))
 
 
 @cli.command()
 @click.pass_obj
 def stats(store: OpenSearchStore) -> None:
-    click.echo(json.dumps(store.get_stats(), indent=2))
+    click.echo(_dumps(store.get_stats()))
 
 
 @cli.command(name="ttl-sweep")
@@ -51,7 +62,7 @@ def stats(store: OpenSearchStore) -> None:
 @click.pass_obj
 def ttl_sweep(store: OpenSearchStore, batch_size: int) -> None:
     result = store.ttl_manager.run_once(batch_size=batch_size)
-    click.echo(json.dumps(result, indent=2))
+    click.echo(_dumps(result))
 
 
 @cli.command()
@@ -60,7 +71,7 @@ def ttl_sweep(store: OpenSearchStore, batch_size: int) -> None:
 @click.pass_obj
 def migrate(store: OpenSearchStore, rollover: bool, new_index: str | None) -> None:
     result = store.migrate(rollover=rollover, new_index=new_index)
-    click.echo(json.dumps(result, indent=2))
+    click.echo(_dumps(result))
 
 
 @cli.group()
@@ -88,7 +99,7 @@ def snapshots_create(
         indices=_comma_to_list(indices),
         wait=wait,
     )
-    click.echo(json.dumps(result, indent=2))
+    click.echo(_dumps(result))
 
 
 @snapshots.command("restore")
@@ -110,7 +121,7 @@ def snapshots_restore(
         indices=_comma_to_list(indices),
         wait=wait,
     )
-    click.echo(json.dumps(result, indent=2))
+    click.echo(_dumps(result))
 
 
 @snapshots.command("delete")
@@ -119,7 +130,7 @@ def snapshots_restore(
 @click.pass_obj
 def snapshots_delete(store: OpenSearchStore, repository: str, snapshot: str) -> None:
     result = store.delete_snapshot(repository=repository, snapshot=snapshot)
-    click.echo(json.dumps(result, indent=2))
+    click.echo(_dumps(result))
 
 
 def main() -> None:  # pragma: no cover - CLI entrypoint
@@ -2,26 +2,65 @@
 
 from __future__ import annotations
 
+import importlib.util
+import os
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any
 
 from .config import Settings
 
 try:  # pragma: no cover - optional dependency is validated at runtime
-    from opensearchpy import AWSV4SignerAuth, OpenSearch
+    from opensearchpy import OpenSearch, Urllib3AWSV4SignerAuth, Urllib3HttpConnection
+    from opensearchpy.exceptions import SerializationError
+    from opensearchpy.serializer import JSONSerializer
 except ImportError as exc:  # pragma: no cover
-    raise ImportError(
-        "opensearch-py must be installed to use langgraph-opensearch-store."
-    ) from exc
+    raise ImportError("opensearch-py must be installed to use langgraph-opensearch-store.") from exc
 
 try:  # pragma: no cover - optional dependency
-    from botocore.credentials import Credentials
+    import orjson
 except ImportError:  # pragma: no cover
-    Credentials = None  # type: ignore[assignment]
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency
+    from botocore.credentials import RefreshableCredentials
+except ImportError:  # pragma: no cover
+    RefreshableCredentials = None  # type: ignore[assignment]
+
+
+class _OrjsonSerializer(JSONSerializer):
+    """JSON serializer backed by orjson; encodes float vectors and numpy arrays natively."""
+
+    def dumps(self, data: Any) -> Any:
+        if isinstance(data, str):
+            return data
+        try:
+            return orjson.dumps(
+                data, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+        except (TypeError, orjson.JSONEncodeError) as exc:
+            raise SerializationError(data, exc) from exc
+
+    def loads(self, s: str) -> Any:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError as exc:
+            raise SerializationError(s, exc) from exc
 
 
-def create_client(settings: Settings) -> OpenSearch:
-    """Instantiate an OpenSearch client based on the provided settings."""
+_CredentialKey = tuple[str, str | None, str, str | None]
+
+# Process-wide SigV4 credentials keyed by (region, role ARN, session name, token file).
+_CRED_CACHE: dict[_CredentialKey, Any] = {}
+# Signers wrap the shared credentials, so they are reused per identity + service too.
+_SIGNER_CACHE: dict[tuple[str, str, _CredentialKey], Any] = {}
+
+
+def create_client(settings: Settings, **client_kwargs: Any) -> OpenSearch:
+    """Instantiate an OpenSearch client based on the provided settings.
+
+    `client_kwargs` are passed to `OpenSearch` and override the derived defaults.
+    """
 
     kwargs: dict[str, Any] = {
         "hosts": settings.host_urls(),
@@ -30,73 +69,174 @@ def create_client(settings: Settings) -> OpenSearch:
         "headers": settings.extra_headers or None,
         "retry_on_status": [429, 502, 503, 504],
         "max_retries": 3,
+        "connection_class": Urllib3HttpConnection,
+        "pool_maxsize": _pool_maxsize(settings),
+        "http_compress": settings.http_compress,
+        "sniff_on_start": False,
+        "serializer": _serializer(),
     }
 
     if settings.auth_mode == "basic":
         kwargs["http_auth"] = _basic_auth(settings)
     else:
         kwargs["http_auth"] = _sigv4_auth(settings)
+    kwargs.update(client_kwargs)
 
     return OpenSearch(**{k: v for k, v in kwargs.items() if v is not None})
 
 
+@lru_cache(maxsize=1)
+def async_client_available() -> bool:
+    """Whether the `async` extra (aiohttp) is installed, so `create_async_client` can work."""
+
+    return importlib.util.find_spec("aiohttp") is not None
+
+
+def create_async_client(settings: Settings, **client_kwargs: Any) -> Any:
+    """Instantiate an `AsyncOpenSearch` client (requires `opensearch-py[async]`).
+
+    `client_kwargs` are passed to `AsyncOpenSearch` and override the derived defaults.
+    """
+
+    try:  # pragma: no cover - aiohttp is optional
+        from opensearchpy import AIOHttpConnection, AsyncOpenSearch, AWSV4SignerAsyncAuth
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError(
+            "opensearch-py[async] must be installed to use the async OpenSearch client."
+        ) from exc
+
+    kwargs: dict[str, Any] = {
+        "hosts": settings.host_urls(),
+        "verify_certs": settings.verify_certs,
+        "timeout": settings.timeout,
+        "headers": settings.extra_headers or None,
+        "retry_on_status": [429, 502, 503, 504],
+        "max_retries": 3,
+        "connection_class": AIOHttpConnection,
+        "maxsize": _pool_maxsize(settings),
+        "http_compress": settings.http_compress,
+        "serializer": _serializer(),
+    }
+
+    if settings.auth_mode == "basic":
+        kwargs["http_auth"] = _basic_auth(settings)
+    else:
+        if settings.aws_region is None:
+            msg = "aws_region is required when auth_mode='sigv4'"
+            raise ValueError(msg)
+        signer_key = ("async", settings.aws_service, _credential_key(settings))
+        signer = _SIGNER_CACHE.get(signer_key)
+        if signer is None:
+            signer = AWSV4SignerAsyncAuth(
+                _sigv4_credentials(settings), settings.aws_region, settings.aws_service
+            )
+            _SIGNER_CACHE[signer_key] = signer
+        kwargs["http_auth"] = signer
+    kwargs.update(client_kwargs)
+
+    return AsyncOpenSearch(**{k: v for k, v in kwargs.items() if v is not None})
+
+
+def _serializer() -> JSONSerializer | None:
+    return _OrjsonSerializer() if orjson is not None else None
+
+
+def _pool_maxsize(settings: Settings) -> int:
+    """Keep-alive connections per node; sized for thread fan-out from `abatch`."""
+    if settings.pool_maxsize is not None:
+        return settings.pool_maxsize
+    return max(16, (os.cpu_count() or 1) * 4)
+
+
 def _basic_auth(settings: Settings) -> tuple[str, str] | None:
     if settings.username and settings.password:
         return (settings.username, settings.password.get_secret_value())
     return None
 
 
-def _sigv4_auth(settings: Settings) -> AWSV4SignerAuth:
+def _sigv4_auth(settings: Settings) -> Urllib3AWSV4SignerAuth:
     if settings.aws_region is None:
         msg = "aws_region is required when auth_mode='sigv4'"
         raise ValueError(msg)
+    signer_key = ("sync", settings.aws_service, _credential_key(settings))
+    signer = _SIGNER_CACHE.get(signer_key)
+    if signer is None:
+        signer = Urllib3AWSV4SignerAuth(
+            _sigv4_credentials(settings), settings.aws_region, settings.aws_service
+        )
+        _SIGNER_CACHE[signer_key] = signer
+    return signer
+
+
+def _credential_key(settings: Settings) -> _CredentialKey:
+    return (
+        settings.aws_region or "",
+        settings.aws_role_arn,
+        settings.aws_session_name,
+        settings.aws_web_identity_token_file,
+    )
+
+
+def _sigv4_credentials(settings: Settings) -> Any:
+    """Return refreshable credentials shared by every client built for this identity.
+
+    The signer freezes the credentials per request, so rotated STS tokens are
+    picked up without rebuilding the client.
+    """
+
+    cache_key = _credential_key(settings)
+    cached = _CRED_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:  # pragma: no cover - boto3 is optional
-        from boto3 import client as boto3_client, session as boto3_session
+        from boto3 import session as boto3_session
     except ImportError as exc:  # pragma: no cover
         raise ImportError("boto3 is required for SigV4 authentication") from exc
 
-    session_credentials = None
+    if RefreshableCredentials is None:
+        msg = "botocore is required for SigV4 authentication"
+        raise ImportError(msg)
+
     if settings.aws_role_arn:
-        sts = boto3_client("sts", region_name=settings.aws_region)
-        if settings.aws_web_identity_token_file:
-            token = Path(settings.aws_web_identity_token_file).read_text().strip()
-            resp = sts.assume_role_with_web_identity(
-                RoleArn=settings.aws_role_arn,
-                RoleSessionName=settings.aws_session_name,
-                WebIdentityToken=token,
-            )
-        else:
-            resp = sts.assume_role(
-                RoleArn=settings.aws_role_arn,
-                RoleSessionName=settings.aws_session_name,
-            )
-        session_credentials = resp["Credentials"]
+        credentials = RefreshableCredentials.create_from_metadata(
+            metadata=_assume_role(settings),
+            refresh_using=partial(_assume_role, settings),
+            method="sts-assume-role",
+        )
     else:
-        boto_session = boto3_session.Session()
-        credentials = boto_session.get_credentials()
+        # Session credentials from role-based providers (IMDS, ECS, SSO) refresh themselves.
+        credentials = boto3_session.Session().get_credentials()
         if credentials is None:
             msg = "No AWS credentials available for SigV4 authentication"
             raise RuntimeError(msg)
-        session_credentials = credentials.get_frozen_credentials()
 
-    if Credentials is None:
-        msg = "botocore is required for SigV4 authentication"
-        raise ImportError(msg)
+    _CRED_CACHE[cache_key] = credentials
+    return credentials
 
-    if isinstance(session_credentials, dict):
-        access_key = session_credentials["AccessKeyId"]
-        secret_key = session_credentials["SecretAccessKey"]
-        token = session_credentials.get("SessionToken")
-    else:
-        access_key = session_credentials.access_key
-        secret_key = session_credentials.secret_key
-        token = session_credentials.token
-
-    frozen = Credentials(
-        access_key=access_key,
-        secret_key=secret_key,
-        token=token,
-    )
 
-    return AWSV4SignerAuth(frozen, settings.aws_region, settings.aws_service)
+def _assume_role(settings: Settings) -> dict[str, str]:
+    from boto3 import client as boto3_client
+
+    sts = boto3_client("sts", region_name=settings.aws_region)
+    if settings.aws_web_identity_token_file:
+        token = Path(settings.aws_web_identity_token_file).read_text().strip()
+        resp = sts.assume_role_with_web_identity(
+            RoleArn=settings.aws_role_arn,
+            RoleSessionName=settings.aws_session_name,
+            WebIdentityToken=token,
+        )
+    else:
+        resp = sts.assume_role(
+            RoleArn=settings.aws_role_arn,
+            RoleSessionName=settings.aws_session_name,
+        )
+    creds = resp["Credentials"]
+    expiration = creds["Expiration"]
+    expiry_time = expiration.isoformat() if hasattr(expiration, "isoformat") else str(expiration)
+    return {
+        "access_key": creds["AccessKeyId"],
+        "secret_key": creds["SecretAccessKey"],
+        "token": creds.get("SessionToken"),
+        "expiry_time": expiry_time,
+    }
@@ -2,19 +2,38 @@
 
 from __future__ import annotations
 
+import re
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Iterable, Literal, Sequence
+from typing import Any, Iterable, Literal, Self, Sequence
 
 from urllib.parse import parse_qs, urlsplit
 
 from typing import ClassVar
 
-from pydantic import Field, PositiveInt, SecretStr, field_validator, model_validator
+from pydantic import (
+    Field,
+    NonNegativeInt,
+    PositiveInt,
+    PrivateAttr,
+    SecretStr,
+    field_validator,
+    model_validator,
+)
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 NamespacePath = tuple[str, ...]
 
+# `KEY=value` lines; comments and blank lines never match because keys must start
+# with a letter or underscore.
+_ENV_LINE_RE = re.compile(
+    r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*\r?$", re.MULTILINE
+)
+_HOST_SPLIT_RE = re.compile(r"\s*,\s*")
+_HOST_SCHEMES = ("http://", "https://")
+_DEFAULT_PORTS = {"https": 443, "http": 80}
+
 
 class Settings(BaseSettings):
     """Typed configuration, validated when the module imports."""
@@ -28,6 +47,19 @@ class Settings(BaseSettings):
     index_prefix: str = "langgraph"
     embedding_dim: PositiveInt = 1536
     vector_engine: Literal["lucene"] = "lucene"
+    hnsw_m: PositiveInt = 24
+    hnsw_ef_construction: PositiveInt = 128
+    hnsw_ef_search: PositiveInt = 100
+    vector_quantization: Literal["fp32", "byte"] = "fp32"
+    warmup_on_setup: bool = True
+    stored_scripts: bool = True
+    index_refresh_interval: str = "5s"
+    translog_flush_threshold_size: str = "1gb"
+    index_replicas: NonNegativeInt = 1
+    bulk_pause_refresh_threshold: PositiveInt = 1000
+    buffered_writes: bool = False
+    index_batch_size: PositiveInt = 100
+    index_flush_interval: float = 1.0
     use_agentic_memory_api: bool = False
     aws_region: str | None = None
     aws_service: Literal["es", "aoss"] = "es"
@@ -37,10 +69,19 @@ class Settings(BaseSettings):
     verify_certs: bool = True
     ignore_ssl_certs: bool = False
     timeout: float = 30.0
+    pool_maxsize: PositiveInt | None = None
+    http_compress: bool = True
     extra_headers: dict[str, str] = Field(default_factory=dict)
     search_mode: Literal["auto", "text", "vector", "hybrid"] = "auto"
     search_num_candidates: int = 200
     search_similarity_threshold: float | None = None
+    hybrid_auto_fallback: bool = True
+    namespace_hash_filter: bool = False
+    local_vector_cache: bool = False
+    local_vector_cache_max_docs: PositiveInt = 10_000
+    local_vector_cache_ttl_seconds: float = 60.0
+    embedding_cache_size: int = 10_000
+    embedding_cache_ttl_seconds: float | None = None
     ttl_minutes_default: float | None = None
     ttl_refresh_on_read: bool = False
     log_operations: bool = True
@@ -53,41 +94,76 @@ class Settings(BaseSettings):
         case_sensitive=False,
     )
 
+    _data_index_alias: str = PrivateAttr(default="")
+    _data_index_bootstrap: str = PrivateAttr(default="")
+    _namespace_index_name: str = PrivateAttr(default="")
+    _host_urls: list[str] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._cache_derived_names()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in {"index_prefix", "hosts"}:
+            self._cache_derived_names()
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        # `update` bypasses `__setattr__`, so the cached names must be rebuilt here.
+        copy = super().model_copy(update=update, deep=deep)
+        copy._cache_derived_names()
+        return copy
+
+    def _cache_derived_names(self) -> None:
+        """Precompute index names and host URLs read on every store operation."""
+        prefix = self.index_prefix
+        self._data_index_alias = f"{prefix}-data"
+        self._data_index_bootstrap = f"{prefix}-data-v{self.template_version:02d}-000001"
+        self._namespace_index_name = f"{prefix}-namespace"
+        hosts = self.hosts
+        self._host_urls = list(hosts) if isinstance(hosts, list) else [hosts]
+
     @field_validator("hosts", mode="before")
     @classmethod
     def _split_hosts(cls, value: str | Sequence[str]) -> list[str]:  # type: ignore[override]
         if isinstance(value, str):
-            parts = [part.strip() for part in value.split(",") if part.strip()]
+            parts = [part for part in _HOST_SPLIT_RE.split(value.strip()) if part]
         else:
             parts = list(value)
         if not parts:
             msg = "At least one OpenSearch host is required"
             raise ValueError(msg)
-        normalized = []
-        for part in parts:
-            normalized.append(part if part.startswith("http") else f"https://{part}")
-        return normalized
+        return [
+            part if part.lower().startswith(_HOST_SCHEMES) else f"https://{part}" for part in parts
+        ]
 
     def namespace_to_index(self, namespace: NamespacePath) -> str:
-        """Return the active data index alias (namespaces live in a shared index)."""
-        return self.data_index_alias
+        """Return the active data index alias (namespaces live in a shared index).
+
+        Every namespace maps to the same alias, precomputed in `_cache_derived_names`,
+        so there is no per-namespace lookup to cache.
+        """
+        return self._data_index_alias
 
     @property
     def data_index_alias(self) -> str:
-        return f"{self.index_prefix}-data"
+        return self._data_index_alias
 
     @property
     def data_index_bootstrap(self) -> str:
-        return f"{self.index_prefix}-data-v{self.template_version:02d}-000001"
+        return self._data_index_bootstrap
 
     @property
     def namespace_index_name(self) -> str:
-        return f"{self.index_prefix}-namespace"
+        return self._namespace_index_name
+
+    @property
+    def uses_stored_scripts(self) -> bool:
+        """Whether painless scripts are referenced by id (serverless has no stored scripts)."""
+        return self.stored_scripts and self.aws_service != "aoss"
 
     def host_urls(self) -> list[str]:
         """Return hosts as a normalized list."""
-        value = self.hosts
-        return value if isinstance(value, list) else [value]
+        return self._host_urls
 
     @classmethod
     def from_conn_string(cls, conn_str: str, **overrides: Any) -> "Settings":
@@ -108,15 +184,7 @@ class Settings(BaseSettings):
         if not env_path.exists():
             msg = f"Env file not found: {path}"
             raise FileNotFoundError(msg)
-        data: dict[str, Any] = {}
-        for raw_line in env_path.read_text().splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            data[key.strip()] = value.strip()
+        data: dict[str, Any] = dict(_ENV_LINE_RE.findall(env_path.read_text()))
         return cls(**data)
 
 
@@ -139,9 +207,8 @@ class SettingsBuilder:
     def from_conn_string(self, conn_str: str) -> "SettingsBuilder":
         parsed = urlsplit(conn_str)
         host = parsed.hostname or "localhost"
-        port = parsed.port or (443 if parsed.scheme == "https" else 80)
-        hosts = [f"{parsed.scheme}://{host}:{port}"]
-        self._data["hosts"] = hosts
+        port = parsed.port or _DEFAULT_PORTS.get(parsed.scheme, 80)
+        self._data["hosts"] = [f"{parsed.scheme}://{host}:{port}"]
         if parsed.username:
             self._data["username"] = parsed.username
         if parsed.password:
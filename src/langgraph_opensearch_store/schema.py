@@ -2,41 +2,81 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from opensearchpy import TransportError
+
 from .config import Settings
 
+logger = logging.getLogger("langgraph.opensearch.schema")
+
+# Scripted upsert that keeps a namespace's document count and metadata current.
+NAMESPACE_STATS_SCRIPT_ID = "ns_stats_upsert"
+NAMESPACE_STATS_SCRIPT = (
+    "if (ctx._source.doc_count == null) { ctx._source.doc_count = 0; } "
+    "ctx._source.doc_count = Math.max(0, ctx._source.doc_count + params.delta); "
+    "ctx._source.updated_at = params.updated_at; "
+    "ctx._source.namespace = params.namespace; "
+    "ctx._source.namespace_key = params.namespace_key; "
+    "ctx._source.depth = params.depth;"
+)
+
+
+def namespace_stats_script_id(settings: Settings) -> str:
+    """Stored-script id for the namespace-stats upsert, scoped to the store's index prefix."""
+
+    return f"{settings.index_prefix}-{NAMESPACE_STATS_SCRIPT_ID}"
+
+
 def data_index_template(settings: Settings) -> dict[str, Any]:
+    index_settings: dict[str, Any] = {
+        "knn": True,
+        "query": {"default_field": "doc.text"},
+    }
+    if settings.aws_service != "aoss":
+        # Serverless collections manage refresh, translog and replicas themselves.
+        index_settings.update(
+            {
+                "refresh_interval": settings.index_refresh_interval,
+                "translog": {"flush_threshold_size": settings.translog_flush_threshold_size},
+                "number_of_replicas": settings.index_replicas,
+            }
+        )
+    embedding_mapping: dict[str, Any] = {
+        "type": "knn_vector",
+        "dimension": settings.embedding_dim,
+        "method": {
+            "name": "hnsw",
+            "engine": settings.vector_engine,
+            "space_type": "cosinesimil",
+            "parameters": {
+                "m": settings.hnsw_m,
+                "ef_construction": settings.hnsw_ef_construction,
+            },
+        },
+    }
+    if settings.vector_quantization == "byte":
+        embedding_mapping["data_type"] = "byte"
     return {
         "index_patterns": [f"{settings.index_prefix}-data-*"],
         "template": {
-            "settings": {
-                "index": {
-                    "knn": True,
-                    "query": {"default_field": "doc.text"},
-                }
-            },
+            "settings": {"index": index_settings},
             "mappings": {
                 "properties": {
                     "namespace": {"type": "keyword"},
                     "namespace_key": {"type": "keyword"},
+                    "namespace_hash": {"type": "long"},
                     "key": {"type": "keyword"},
                     "depth": {"type": "integer"},
                     "metadata": {"type": "object", "enabled": True},
                     "doc": {"type": "object", "enabled": True},
                     "created_at": {"type": "date"},
                     "updated_at": {"type": "date"},
-                    "embedding": {
-                        "type": "knn_vector",
-                        "dimension": settings.embedding_dim,
-                        "method": {
-                            "name": "hnsw",
-                            "engine": settings.vector_engine,
-                            "space_type": "cosinesimil",
-                        },
-                    },
+                    "embedding": embedding_mapping,
+                    "embedding_scale": {"type": "float", "index": False},
                     "ttl_expires_at": {"type": "date", "null_value": None},
                 }
             },
@@ -71,7 +111,9 @@ class TemplateManager:
     def apply(self) -> None:
         self._ensure_data_template()
         self._ensure_namespace_index()
+        self._ensure_stored_scripts()
         self._ensure_bootstrap_index()
+        self._warm_vector_graphs()
 
     def upgrade(self, *, rollover: bool = False, new_index: str | None = None) -> dict[str, Any]:
         """Reapply templates and optionally roll the data alias to a fresh index."""
@@ -79,6 +121,7 @@ class TemplateManager:
         summary: dict[str, Any] = {"rolled_over": False, "new_index": None}
         self._ensure_data_template()
         self._ensure_namespace_index()
+        self._ensure_stored_scripts()
         if rollover:
             target = new_index or self._next_rollover_index()
             response = self.client.indices.rollover(
@@ -91,6 +134,7 @@ class TemplateManager:
             summary["rolled_over"] = bool(response.get("rolled_over"))
             summary["new_index"] = response.get("new_index", target)
         self._ensure_bootstrap_index()
+        self._warm_vector_graphs()
         return summary
 
     # -------------------------------------------------
@@ -113,6 +157,34 @@ class TemplateManager:
         if not exists:
             self.client.indices.create(index=index_name, body=namespace_index_body(), ignore=[400])
 
+    def _ensure_stored_scripts(self) -> None:
+        if not self.settings.uses_stored_scripts:
+            return
+        self.client.put_script(
+            id=namespace_stats_script_id(self.settings),
+            body={"script": {"lang": "painless", "source": NAMESPACE_STATS_SCRIPT}},
+        )
+
+    def _warm_vector_graphs(self) -> None:
+        """Run a throwaway k=1 kNN query so HNSW graphs load before the first real search.
+
+        `_plugins/_knn/warmup` only loads nmslib/faiss graphs into native memory; the
+        Lucene engine (the only one `vector_engine` allows) is warmed by searching.
+        """
+
+        if not self.settings.warmup_on_setup:
+            return
+        body = {
+            "size": 1,
+            "_source": False,
+            # Any non-zero vector works; an all-zero vector is invalid for cosine space.
+            "query": {"knn": {"embedding": {"vector": [1] * self.settings.embedding_dim, "k": 1}}},
+        }
+        try:
+            self.client.search(index=self.settings.data_index_alias, body=body, ignore=[400, 404])
+        except TransportError:
+            logger.warning("knn_warmup_failed", exc_info=True)
+
     def _next_rollover_index(self) -> str:
         timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
         return f"{self.settings.index_prefix}-data-v{self.settings.template_version:02d}-{timestamp}"
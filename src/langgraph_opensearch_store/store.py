@@ -3,12 +3,24 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import hashlib
+import heapq
 import logging
+import re
+import threading
 import time
-from collections.abc import Iterable, Mapping
-from datetime import datetime, timedelta, timezone
+import weakref
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from datetime import UTC, datetime, timedelta, timezone
 from typing import Any, Literal, Sequence
 
+import numpy as np
 from langchain_core.embeddings import Embeddings
 from langgraph.store.base import (
     BaseStore,
@@ -21,45 +33,204 @@ from langgraph.store.base import (
     SearchItem,
     SearchOp,
 )
+from opensearchpy import NotFoundError, TransportError, helpers
 
-from .client import create_client
+from ._embed_cache import CachedEmbeddings
+from ._mmr import mmr_order
+from .client import _OrjsonSerializer, async_client_available, create_async_client, create_client
 from .config import NamespacePath, Settings
-from .schema import TemplateManager
-
-ISO_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+from .schema import NAMESPACE_STATS_SCRIPT, TemplateManager, namespace_stats_script_id
+
+BULK_CHUNK_SIZE = 500
+BULK_MAX_CHUNK_BYTES = 100 * 1024 * 1024
+HYBRID_FALLBACK_MAX_TERMS = 3
+# Reciprocal-rank fusion scores a hit at 1-based rank r as 1 / (RRF_RANK_CONSTANT + r).
+RRF_RANK_CONSTANT = 1
+NAMESPACE_PAGE_SIZE = 1000
+NAMESPACE_CURSOR_TTL = 60.0
+NAMESPACE_CURSOR_LIMIT = 64
+# Error type OpenSearch reports when a referenced stored script is not registered.
+MISSING_SCRIPT_ERROR = "resource_not_found_exception"
 logger = logging.getLogger("langgraph.opensearch.store")
 
+# Where a `list_namespaces` page ended: the composite `after_key` of its last bucket and
+# the namespaces listed so far (truncated prefixes can recur further down the key order).
+_NamespaceCursor = tuple[dict[str, Any] | None, frozenset[NamespacePath]]
+
+# (namespace, key, value, ttl_minutes); a `None` value is a delete.
+_BufferedWrite = tuple[NamespacePath, str, Mapping[str, Any] | None, float | None]
+
+# Fallback for timestamps `datetime.fromisoformat` rejects (e.g. comma fractions, `+HH`).
+_ISO_RE = re.compile(
+    r"(\d{4})-?(\d{2})-?(\d{2})[Tt ](\d{2}):?(\d{2}):?(\d{2})(?:[.,](\d+))?"
+    r"\s*(Z|z|[+-]\d{2}(?::?\d{2})?)?$"
+)
+
+# Filter fragments shared by every search body; they are serialized, never mutated.
+_TTL_UNSET_CLAUSE: dict[str, Any] = {"bool": {"must_not": {"exists": {"field": "ttl_expires_at"}}}}
+
+# Stored vectors are only read back by MMR and the local vector cache; every other read
+# leaves them on the node instead of shipping kilobytes of floats per hit.
+_VECTOR_SOURCE_FIELDS = ["embedding", "embedding_scale"]
+_NO_VECTOR_SOURCE: dict[str, Any] = {"excludes": _VECTOR_SOURCE_FIELDS}
+
 
 def _now() -> datetime:
-    return datetime.now(timezone.utc)
+    return datetime.now(UTC)
 
 
 def _serialize_ts(value: datetime) -> str:
-    return value.strftime(ISO_FORMAT)
+    # Fixed-width microseconds keep serialized UTC timestamps lexicographically ordered.
+    return value.isoformat(timespec="microseconds")
+
+
+def _is_canonical_ts(value: str) -> bool:
+    """True for timestamps laid out exactly like `_serialize_ts` output for UTC."""
+
+    return len(value) == 32 and value.endswith("+00:00") and value[:4].isdigit()
 
 
 def _parse_ts(raw: str | None) -> datetime:
     if not raw:
         return _now()
-    for fmt in (ISO_FORMAT, "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S"):
-        try:
-            return datetime.strptime(raw, fmt)
-        except ValueError:
-            continue
+    parsed = _parse_iso(raw)
+    return _now() if parsed is None else parsed
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(raw: str) -> datetime | None:
+    # Many documents in one response share timestamps, hence the cache.
     try:
         return datetime.fromisoformat(raw)
     except ValueError:
-        return _now()
+        pass
+    match = _ISO_RE.match(raw.strip())
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    tzinfo = None
+    if offset:
+        if offset in ("Z", "z"):
+            tzinfo = UTC
+        else:
+            digits = offset[1:].replace(":", "")
+            delta = timedelta(hours=int(digits[:2]), minutes=int(digits[2:4] or 0))
+            tzinfo = timezone(-delta if offset[0] == "-" else delta)
+    fields = [int(part) for part in (year, month, day, hour, minute, second)]
+    micros = int((fraction or "0")[:6].ljust(6, "0"))
+    try:
+        return datetime(*fields, micros, tzinfo=tzinfo)
+    except ValueError:
+        return None
+
+
+def _refresh_intervals(response: Mapping[str, Any]) -> dict[str, Any]:
+    """Map each index in a `get_settings` response to its `refresh_interval`.
+
+    Indices without an explicit value map to `None`, which resets them to the default.
+    """
+
+    return {
+        index: entry.get("settings", {}).get("index", {}).get("refresh_interval")
+        for index, entry in response.items()
+    }
 
 
+# Keys and ids are rebuilt for the same namespaces on every op; `NamespacePath` tuples
+# hash cheaply, so memoize the joins.
+@lru_cache(maxsize=8192)
 def _namespace_key(namespace: NamespacePath) -> str:
     return "::".join(namespace)
 
 
+@lru_cache(maxsize=8192)
 def _document_id(namespace: NamespacePath, key: str) -> str:
     return f"{_namespace_key(namespace)}::{key}"
 
 
+@lru_cache(maxsize=4096)
+def _namespace_hash(namespace: NamespacePath) -> int:
+    """Signed 64-bit digest of the namespace key, stored in the `long` `namespace_hash` field."""
+
+    digest = hashlib.blake2b(_namespace_key(namespace).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _namespace_term(namespace: NamespacePath, by_hash: bool = False) -> dict[str, Any]:
+    # Built per call so callers may extend the clause; only the digest is cached.
+    if by_hash:
+        return {"term": {"namespace_hash": _namespace_hash(namespace)}}
+    return {"term": {"namespace_key": _namespace_key(namespace)}}
+
+
+def _ttl_live_clause(now: str) -> dict[str, Any]:
+    # Built per call: `now` has microsecond precision, so a cache would never hit, and
+    # callers get a dict of their own.
+    return {
+        "bool": {
+            "should": [
+                _TTL_UNSET_CLAUSE,
+                {"range": {"ttl_expires_at": {"gt": now}}},
+            ],
+            "minimum_should_match": 1,
+        }
+    }
+
+
+def _bulk_item_failed(ok: bool, result: Mapping[str, Any]) -> bool:
+    """Whether a bulk item failed; deleting an already missing doc is not a failure."""
+
+    if ok:
+        return False
+    op_type, info = next(iter(result.items()))
+    return not (op_type == "delete" and info.get("status") == 404)
+
+
+def _namespace_buckets_body(
+    prefix_path: NamespacePath | None, size: int, after: dict[str, Any] | None
+) -> dict[str, Any]:
+    composite: dict[str, Any] = {
+        "size": size,
+        "sources": [{"namespace_key": {"terms": {"field": "namespace_key"}}}],
+    }
+    if after is not None:
+        composite["after"] = after
+    body: dict[str, Any] = {
+        "size": 0,
+        "aggs": {
+            "namespaces": {
+                "composite": composite,
+                # The stored array keeps labels containing "::" intact, which splitting
+                # the bucket key would not.
+                "aggs": {"namespace": {"top_hits": {"size": 1, "_source": ["namespace"]}}},
+            }
+        },
+    }
+    if prefix_path:
+        prefix_clause = {"prefix": {"namespace_key": _namespace_key(prefix_path)}}
+        body["query"] = {"bool": {"filter": [prefix_clause]}}
+    return body
+
+
+def _bucket_namespace(bucket: Mapping[str, Any]) -> Any:
+    hits = bucket.get("namespace", {}).get("hits", {}).get("hits", [])
+    return hits[0].get("_source", {}).get("namespace") if hits else None
+
+
+def _coerce_op(op: Op) -> Op:
+    """Turn list namespaces (JSON round-trips, user input) into the tuples the caches need."""
+
+    if isinstance(op, (PutOp, GetOp)) and not isinstance(op.namespace, tuple):
+        return op._replace(namespace=tuple(op.namespace))
+    if isinstance(op, SearchOp) and not isinstance(op.namespace_prefix, tuple):
+        return op._replace(namespace_prefix=tuple(op.namespace_prefix))
+    return op
+
+
+def _is_put(entry: tuple[int, Op]) -> bool:
+    return isinstance(entry[1], PutOp)
+
+
 def _extract_condition(conditions, match_type: str) -> NamespacePath | None:
     for condition in conditions:
         if getattr(condition, "match_type", None) == match_type:
@@ -77,10 +248,45 @@ def _suffix_matches(namespace: NamespacePath, suffix: NamespacePath) -> bool:
     return namespace[-len(suffix) :] == tuple(suffix)
 
 
-def _compute_ttl_expires(ttl_minutes: float | None) -> str | None:
+def _cached_embeddings(embeddings: Embeddings | None, settings: Settings) -> Embeddings | None:
+    if embeddings is None or settings.embedding_cache_size <= 0:
+        return embeddings
+    if isinstance(embeddings, CachedEmbeddings):
+        return embeddings
+    return CachedEmbeddings(
+        embeddings,
+        maxsize=settings.embedding_cache_size,
+        ttl_seconds=settings.embedding_cache_ttl_seconds,
+    )
+
+
+def _write_result(resp: Any) -> str | None:
+    """`result` of an index/delete response (`created`, `updated`, `deleted`, `not_found`)."""
+
+    return resp.get("result") if isinstance(resp, Mapping) else None
+
+
+def _int8_scale(vector: Sequence[float]) -> float:
+    """Per-vector scale mapping the largest component magnitude onto 127."""
+
+    peak = float(np.max(np.abs(np.asarray(vector, dtype=np.float32)), initial=0.0))
+    return peak / 127.0
+
+
+def _quantize_int8(vector: Sequence[float]) -> np.ndarray:
+    # Cosine similarity ignores per-vector scale, so each vector uses the full int8 range;
+    # `v ~= q * scale` recovers the original magnitude if needed.
+    scale = _int8_scale(vector)
+    values = np.asarray(vector, dtype=np.float32)
+    if scale == 0.0:
+        return np.zeros(values.shape, dtype=np.int8)
+    return np.clip(np.rint(values / scale), -127, 127).astype(np.int8)
+
+
+def _compute_ttl_expires(ttl_minutes: float | None, now: datetime | None = None) -> str | None:
     if ttl_minutes is None:
         return None
-    expires_at = _now() + timedelta(minutes=ttl_minutes)
+    expires_at = (now or _now()) + timedelta(minutes=ttl_minutes)
     return _serialize_ts(expires_at)
 
 
@@ -95,12 +301,42 @@ class OpenSearchStore(BaseStore):
         settings: Settings,
         client: Any | None = None,
         embeddings: Embeddings | None = None,
+        async_client: Any | None = None,
     ) -> None:
         self.settings = settings
         self._client = client
-        self._embeddings = embeddings
+        self._async_client = async_client
+        # A caller-configured sync client is never shadowed by a second, default async one.
+        self._sync_client_injected = client is not None
+        self._embeddings = _cached_embeddings(embeddings, settings)
         self._metrics = MetricsEmitter(enabled=settings.metrics_enabled)
         self._ttl_manager = TTLManager(self)
+        # (namespace, key) -> latest pending write, so a re-put replaces the queued value.
+        self._bulk_buffer: dict[tuple[NamespacePath, str], _BufferedWrite] = {}
+        self._buffer_started: float | None = None
+        # `_flush_lock` only guards the buffer; `_send_lock` keeps flushes in order while
+        # writers keep queueing during the network round-trip.
+        self._flush_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        # Bulk loads currently pausing refreshes, and the intervals to restore after them.
+        self._refresh_pause_lock = threading.Lock()
+        self._refresh_pausers = 0
+        self._paused_refresh_intervals: dict[str, Any] | None = None
+        self._flush_timer: threading.Timer | None = None
+        self._background_flush_error: Exception | None = None
+        self._numpy_bodies: bool | None = None
+        # (prefix, suffix, max_depth, offset) -> (expires, cursor) left by the page ending there
+        self._namespace_cursors: OrderedDict[tuple[Any, ...], tuple[float, _NamespaceCursor]] = (
+            OrderedDict()
+        )
+        self._namespace_cursors_lock = threading.Lock()
+        # Set once an update finds the stored stats script missing; later ones go inline.
+        self._stored_stats_script_missing = False
+        # namespace_key -> (expires, (unit vectors, hits) or None when too large to cache)
+        self._vector_cache: dict[str, tuple[float, tuple[np.ndarray, list[dict[str, Any]]] | None]] = {}
+        self._vector_cache_lock = threading.Lock()
+        if settings.buffered_writes:
+            _BUFFERED_STORES.add(self)
 
     @classmethod
     def from_settings(
@@ -121,7 +357,7 @@ class OpenSearchStore(BaseStore):
         """Instantiate the store from keyword args instead of relying on `.env`."""
 
         settings = Settings(**settings_kwargs)
-        return cls(settings=settings, client=None, embeddings=embeddings)
+        return cls.from_settings(settings=settings, embeddings=embeddings)
 
     @classmethod
     def from_conn_string(
@@ -132,7 +368,7 @@ class OpenSearchStore(BaseStore):
         **overrides: Any,
     ) -> "OpenSearchStore":
         settings = Settings.from_conn_string(conn_str, **overrides)
-        return cls(settings=settings, client=None, embeddings=embeddings)
+        return cls.from_settings(settings=settings, embeddings=embeddings)
 
     def setup(self, *, client: Any | None = None) -> None:
         es = client or self.client
@@ -144,6 +380,33 @@ class OpenSearchStore(BaseStore):
             self._client = create_client(self.settings)
         return self._client
 
+    @property
+    def async_client(self) -> Any:
+        """`AsyncOpenSearch` client used by `abatch`; created on first use."""
+
+        if self._async_client is None:
+            self._async_client = create_async_client(self.settings)
+        return self._async_client
+
+    @property
+    def _native_async(self) -> bool:
+        """Whether async methods use `AsyncOpenSearch` instead of offloading to a thread.
+
+        Without the `async` extra, or when only a sync `client` was injected, the async
+        API runs the sync implementation through `asyncio.to_thread`.
+        """
+
+        if self._async_client is not None:
+            return True
+        return not self._sync_client_injected and async_client_available()
+
+    async def aclose(self) -> None:
+        """Close the async client's HTTP session, if one was opened."""
+
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
     @property
     def ttl_manager(self) -> "TTLManager":
         return self._ttl_manager
@@ -225,93 +488,1090 @@ class OpenSearchStore(BaseStore):
     # ------------------------------------------------------------------
     # BaseStore API
     def batch(self, ops: Iterable[Op]) -> list[Any]:
-        return [self._execute_op(op) for op in ops]
+        """Execute ops in order, sharing requests between consecutive ops of one kind.
+
+        Each run of two or more consecutive `PutOp`s is sent as one `_bulk` request
+        (duplicate puts to one key keep the last value); each run of consecutive reads
+        shares requests, `GetOp`s one `_mget` and `SearchOp`s one `_msearch`. A read
+        therefore sees every write that precedes it in the batch.
+        """
+
+        ops = [_coerce_op(op) for op in ops]
+        results: list[Any] = [None] * len(ops)
+        for is_put, run in groupby(enumerate(ops), key=_is_put):
+            if is_put:
+                self._execute_put_run([op for _, op in run])
+            else:
+                self._execute_reads(list(run), results)
+        return results
 
     async def abatch(self, ops: Iterable[Op]) -> list[Any]:
-        return await asyncio.gather(*[asyncio.to_thread(self._execute_op, op) for op in ops])
+        ops = [_coerce_op(op) for op in ops]
+        if not self._native_async:
+            return await asyncio.to_thread(self.batch, ops)
+        results: list[Any] = [None] * len(ops)
+        for is_put, run in groupby(enumerate(ops), key=_is_put):
+            if is_put:
+                await self._a_execute_put_run([op for _, op in run])
+            else:
+                await self._a_execute_reads(list(run), results)
+        return results
+
+    def search(
+        self,
+        namespace_prefix: NamespacePath,
+        /,
+        *,
+        query: str | None = None,
+        filter: dict[str, Any] | None = None,
+        limit: int = 10,
+        offset: int = 0,
+        refresh_ttl: bool | None = None,
+        mmr_lambda: float | None = None,
+    ) -> list[SearchItem]:
+        """Search within a namespace prefix.
+
+        Pass `mmr_lambda` (0..1, e.g. `0.7`) to diversify results: a single kNN request
+        over-fetches candidates with their embeddings, which are re-ranked client-side
+        with maximal marginal relevance.
+        """
+
+        if mmr_lambda is None or not query or self._embeddings is None:
+            return super().search(
+                namespace_prefix,
+                query=query,
+                filter=filter,
+                limit=limit,
+                offset=offset,
+                refresh_ttl=refresh_ttl,
+            )
+        start = time.perf_counter()
+        namespace_prefix = tuple(namespace_prefix)
+        filters = self._build_filters(namespace_prefix, filter)
+        vector = self._embed_query(query)
+        body = self._mmr_search_body(vector, filters, limit + offset)
+        resp = self.client.search(index=self.settings.data_index_alias, body=body)
+        hits = self._mmr_rerank(vector, resp.get("hits", {}).get("hits", []), mmr_lambda, limit, offset)
+        items = self._hits_to_items(hits, refresh_ttl)
+        self._log_event("mmr_search", time.perf_counter() - start, count=len(items))
+        return items
+
+    async def asearch(
+        self,
+        namespace_prefix: NamespacePath,
+        /,
+        *,
+        query: str | None = None,
+        filter: dict[str, Any] | None = None,
+        limit: int = 10,
+        offset: int = 0,
+        refresh_ttl: bool | None = None,
+        mmr_lambda: float | None = None,
+    ) -> list[SearchItem]:
+        """Async counterpart of `search`, including the `mmr_lambda` re-ranking."""
+
+        if mmr_lambda is None or not query or self._embeddings is None:
+            return await super().asearch(
+                namespace_prefix,
+                query=query,
+                filter=filter,
+                limit=limit,
+                offset=offset,
+                refresh_ttl=refresh_ttl,
+            )
+        if not self._native_async:
+            return await asyncio.to_thread(
+                self.search,
+                namespace_prefix,
+                query=query,
+                filter=filter,
+                limit=limit,
+                offset=offset,
+                refresh_ttl=refresh_ttl,
+                mmr_lambda=mmr_lambda,
+            )
+        start = time.perf_counter()
+        namespace_prefix = tuple(namespace_prefix)
+        filters = self._build_filters(namespace_prefix, filter)
+        vector = await self._a_embed_query(query)
+        body = self._mmr_search_body(vector, filters, limit + offset)
+        resp = await self.async_client.search(index=self.settings.data_index_alias, body=body)
+        hits = self._mmr_rerank(vector, resp.get("hits", {}).get("hits", []), mmr_lambda, limit, offset)
+        items = await self._a_hits_to_items(hits, refresh_ttl)
+        self._log_event("mmr_search", time.perf_counter() - start, count=len(items))
+        return items
+
+    def put_many(
+        self,
+        items: Iterable[tuple[NamespacePath, str, Mapping[str, Any] | None]],
+        *,
+        ttl: Any = NOT_PROVIDED,
+    ) -> None:
+        """Write many `(namespace, key, value)` entries through the `_bulk` API.
+
+        Texts are embedded with a single `embed_documents` call and the actions are
+        chunked into `_bulk` requests (429s are retried with backoff). A `None`
+        value deletes the entry, mirroring `put`.
+        """
+
+        ttl_minutes = self._resolve_ttl_minutes(ttl)
+        entries = [(tuple(namespace), key, value, ttl_minutes) for namespace, key, value in items]
+        if not entries:
+            return
+        start = time.perf_counter()
+        count = self._write_entries(entries)
+        self._log_event("put_many", time.perf_counter() - start, count=count)
+
+    def flush(self) -> None:
+        """Send writes buffered by `buffered_writes=True` to OpenSearch.
+
+        Writes that fail to send stay queued and the error is raised; a failed background
+        flush is reported by the next `put` instead, and retried by the next flush.
+        """
+
+        self._background_flush_error = None
+        with self._send_lock:
+            with self._flush_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                entries = list(self._bulk_buffer.values())
+                self._bulk_buffer = {}
+                self._buffer_started = None
+            if not entries:
+                return
+            start = time.perf_counter()
+            try:
+                count = self._write_entries(entries, raise_on_failure=True)
+            except helpers.BulkIndexError as exc:
+                failed = {next(iter(item.values())).get("_id") for item in exc.errors}
+                self._requeue([e for e in entries if _document_id(e[0], e[1]) in failed])
+                raise
+            except BaseException:
+                self._requeue(entries)
+                raise
+            self._log_event("bulk_flush", time.perf_counter() - start, count=count)
+
+    def _flush_in_background(self) -> None:
+        # Runs on the timer thread, where an exception would vanish: keep it for the
+        # next `put` to raise.
+        try:
+            self.flush()
+        except Exception as exc:
+            logger.warning("bulk_flush_failure", exc_info=True)
+            self._background_flush_error = exc
+
+    def _requeue(self, entries: Sequence[_BufferedWrite]) -> None:
+        """Put unsent writes back ahead of the buffer; newer writes to a key still win."""
+
+        with self._flush_lock:
+            pending = self._bulk_buffer
+            requeued = {(e[0], e[1]): e for e in entries if (e[0], e[1]) not in pending}
+            self._bulk_buffer = {**requeued, **pending}
+            if self._bulk_buffer and self._buffer_started is None:
+                self._buffer_started = time.monotonic()
+
+    def search_batch(
+        self,
+        namespace_prefix: NamespacePath,
+        queries: Sequence[str],
+        *,
+        filter: Mapping[str, Any] | None = None,
+        limit: int = 10,
+        offset: int = 0,
+        refresh_ttl: bool | None = None,
+    ) -> list[list[SearchItem]]:
+        """Run several queries against one namespace with a single `_msearch` request.
+
+        Each distinct query is embedded with `embed_query`, exactly as `search` would, and
+        provider errors propagate the same way; hybrid queries contribute a BM25 and a
+        kNN body each and are fused client-side like `search`.
+        """
+
+        queries = list(queries)
+        if not queries:
+            return []
+        start = time.perf_counter()
+        namespace_prefix = tuple(namespace_prefix)
+        filters = self._build_filters(namespace_prefix, filter)
+        modes = [self._determine_search_mode(query) for query in queries]
+        positions = self._embed_positions(queries, modes)
+        vectors: dict[int, Sequence[float]] = {}
+        if positions:
+            embedded = self._embed_queries([queries[i] for i in positions])
+            vectors = dict(zip(positions, embedded))
+        bodies, plan = self._plan_searches(queries, modes, vectors, filters, limit, offset)
+        responses = self._msearch(bodies)
+        hit_lists = self._collect_searches(plan, responses, limit, offset)
+        results = self._hit_lists_to_items(hit_lists, [refresh_ttl] * len(hit_lists))
+        self._log_event("search_batch", time.perf_counter() - start, count=len(queries))
+        return results
+
+    async def asearch_batch(
+        self,
+        namespace_prefix: NamespacePath,
+        queries: Sequence[str],
+        *,
+        filter: Mapping[str, Any] | None = None,
+        limit: int = 10,
+        offset: int = 0,
+        refresh_ttl: bool | None = None,
+    ) -> list[list[SearchItem]]:
+        """Async counterpart of `search_batch`; runs on `AsyncOpenSearch` when available."""
+
+        queries = list(queries)
+        if not queries:
+            return []
+        if not self._native_async:
+            return await asyncio.to_thread(
+                self.search_batch,
+                namespace_prefix,
+                queries,
+                filter=filter,
+                limit=limit,
+                offset=offset,
+                refresh_ttl=refresh_ttl,
+            )
+        start = time.perf_counter()
+        namespace_prefix = tuple(namespace_prefix)
+        hit_lists = await self._a_search_hits(namespace_prefix, queries, filter, limit, offset)
+        results = await self._a_hit_lists_to_items(hit_lists, [refresh_ttl] * len(hit_lists))
+        self._log_event("search_batch", time.perf_counter() - start, count=len(queries))
+        return results
 
     # ------------------------------------------------------------------
     # Internal helpers
     def _execute_op(self, op: Op) -> Any:
+        if not self._timing_enabled:
+            return self._run_op(op)
         start = time.perf_counter()
-        op_name = type(op).__name__
         success = True
         try:
-            if isinstance(op, PutOp):
-                return self._handle_put(op)
-            if isinstance(op, GetOp):
-                return self._handle_get(op)
-            if isinstance(op, SearchOp):
-                return self._handle_search(op)
-            if isinstance(op, ListNamespacesOp):
-                return self._handle_list_namespaces(op)
-            raise NotImplementedError(f"Unhandled op type: {type(op).__name__}")
+            return self._run_op(op)
         except Exception:
             success = False
             raise
         finally:
-            duration = time.perf_counter() - start
-            if self.settings.log_operations:
-                logger.info(
-                    "operation=%s duration_ms=%.3f",
-                    op_name,
-                    duration * 1000,
-                )
-            self._metrics.record(
-                "operation_duration",
-                duration,
-                {
-                    "operation": op_name,
-                    "success": success,
-                },
+            self._record_operation(type(op).__name__, time.perf_counter() - start, success)
+
+    def _run_op(self, op: Op) -> Any:
+        if self._bulk_buffer and not isinstance(op, PutOp):
+            # Keep reads consistent with writes still sitting in the buffer.
+            self.flush()
+        return self._dispatch_op(op)
+
+    @property
+    def _timing_enabled(self) -> bool:
+        return self.settings.log_operations or self._metrics.enabled
+
+    def _execute_put_run(self, puts: Sequence[PutOp]) -> None:
+        if len(puts) < 2 or self.settings.buffered_writes:
+            for op in puts:
+                self._execute_op(op)
+            return
+        self._execute_puts(self._put_entries(puts), len(puts))
+
+    async def _a_execute_put_run(self, puts: Sequence[PutOp]) -> None:
+        if len(puts) < 2 or self.settings.buffered_writes:
+            for op in puts:
+                await self._a_execute_op(op)
+            return
+        entries = self._put_entries(puts)
+        vectors = await self._a_embed_values(
+            [value for _, _, value, _ in entries if value is not None]
+        )
+        await self._a_execute_puts(entries, len(puts), vectors)
+
+    def _execute_puts(
+        self,
+        entries: Sequence[_BufferedWrite],
+        op_count: int,
+        *,
+        vectors: Sequence[Sequence[float] | None] | None = None,
+    ) -> None:
+        start = time.perf_counter()
+        success = True
+        try:
+            if self._bulk_buffer:
+                self.flush()
+            self._write_entries(entries, vectors=vectors)
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._record_batch("PutOp", op_count, time.perf_counter() - start, success)
+
+    async def _a_execute_puts(
+        self,
+        entries: Sequence[_BufferedWrite],
+        op_count: int,
+        vectors: Sequence[Sequence[float] | None],
+    ) -> None:
+        start = time.perf_counter()
+        success = True
+        try:
+            if self._bulk_buffer:
+                await asyncio.to_thread(self.flush)
+            await self._a_write_entries(entries, vectors)
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._record_batch("PutOp", op_count, time.perf_counter() - start, success)
+
+    def _execute_reads(self, reads: Sequence[tuple[int, Op]], results: list[Any]) -> None:
+        gets = [(position, op) for position, op in reads if isinstance(op, GetOp)]
+        searches = [(position, op) for position, op in reads if isinstance(op, SearchOp)]
+        for position, op in reads:
+            if not isinstance(op, (GetOp, SearchOp)):
+                results[position] = self._execute_op(op)
+        for name, group, handler in (
+            ("GetOp", gets, self._handle_gets),
+            ("SearchOp", searches, self._handle_searches),
+        ):
+            if len(group) < 2:
+                for position, op in group:
+                    results[position] = self._execute_op(op)
+                continue
+            start = time.perf_counter()
+            success = True
+            try:
+                if self._bulk_buffer:
+                    self.flush()
+                outcomes = handler([op for _, op in group])
+            except Exception:
+                success = False
+                raise
+            finally:
+                self._record_batch(name, len(group), time.perf_counter() - start, success)
+            for (position, _), outcome in zip(group, outcomes):
+                results[position] = outcome
+
+    async def _a_execute_reads(self, reads: Sequence[tuple[int, Op]], results: list[Any]) -> None:
+        gets = [(position, op) for position, op in reads if isinstance(op, GetOp)]
+        if len(gets) < 2:
+            gets = []
+        searches = [(position, op) for position, op in reads if isinstance(op, SearchOp)]
+        if len(searches) < 2:
+            searches = []
+        grouped = {position for position, _ in (*gets, *searches)}
+        singles = [(position, op) for position, op in reads if position not in grouped]
+        items, found, *single_results = await asyncio.gather(
+            self._a_execute_gets([op for _, op in gets]),
+            self._a_execute_searches([op for _, op in searches]),
+            *(self._a_execute_op(op) for _, op in singles),
+        )
+        for group, outcomes in ((gets, items), (searches, found), (singles, single_results)):
+            for (position, _), outcome in zip(group, outcomes):
+                results[position] = outcome
+
+    async def _a_execute_gets(self, gets: Sequence[GetOp]) -> list[Item | None]:
+        if not gets:
+            return []
+        start = time.perf_counter()
+        success = True
+        try:
+            if self._bulk_buffer:
+                await asyncio.to_thread(self.flush)
+            return await self._a_handle_gets(gets)
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._record_batch("GetOp", len(gets), time.perf_counter() - start, success)
+
+    def _put_entries(self, puts: Iterable[PutOp]) -> list[_BufferedWrite]:
+        entries: dict[tuple[NamespacePath, str], _BufferedWrite] = {}
+        for op in puts:
+            ttl_minutes = None if op.value is None else self._resolve_ttl_minutes(op.ttl)
+            entries[(op.namespace, op.key)] = (op.namespace, op.key, op.value, ttl_minutes)
+        return list(entries.values())
+
+    async def _a_execute_searches(self, searches: Sequence[SearchOp]) -> list[list[SearchItem]]:
+        if not searches:
+            return []
+        start = time.perf_counter()
+        success = True
+        try:
+            if self._bulk_buffer:
+                await asyncio.to_thread(self.flush)
+            return await self._a_handle_searches(searches)
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._record_batch("SearchOp", len(searches), time.perf_counter() - start, success)
+
+    def _dispatch_op(self, op: Op) -> Any:
+        if isinstance(op, PutOp):
+            return self._handle_put(op)
+        if isinstance(op, GetOp):
+            return self._handle_get(op)
+        if isinstance(op, SearchOp):
+            return self._handle_search(op)
+        if isinstance(op, ListNamespacesOp):
+            return self._handle_list_namespaces(op)
+        raise NotImplementedError(f"Unhandled op type: {type(op).__name__}")
+
+    async def _a_execute_op(self, op: Op) -> Any:
+        if not self._timing_enabled:
+            return await self._a_run_op(op)
+        start = time.perf_counter()
+        success = True
+        try:
+            return await self._a_run_op(op)
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._record_operation(type(op).__name__, time.perf_counter() - start, success)
+
+    async def _a_run_op(self, op: Op) -> Any:
+        if self._bulk_buffer and not isinstance(op, PutOp):
+            await asyncio.to_thread(self.flush)
+        if isinstance(op, PutOp) and not self.settings.buffered_writes:
+            return await self._a_handle_put(op)
+        if isinstance(op, GetOp):
+            return await self._a_handle_get(op)
+        if isinstance(op, SearchOp):
+            return await self._a_handle_search(op)
+        # Buffered writes share the sync flush machinery; namespace listing has no
+        # async path yet.
+        return await asyncio.to_thread(self._dispatch_op, op)
+
+    def _record_batch(self, op_name: str, op_count: int, duration: float, success: bool) -> None:
+        if not self._timing_enabled:
+            return
+        for _ in range(op_count):
+            # Keep per-op metrics comparable with the unbatched path.
+            self._record_operation(op_name, duration / op_count, success)
+
+    def _record_operation(self, op_name: str, duration: float, success: bool) -> None:
+        if self.settings.log_operations:
+            logger.info(
+                "operation=%s duration_ms=%.3f",
+                op_name,
+                duration * 1000,
             )
+        self._metrics.record(
+            "operation_duration",
+            duration,
+            {
+                "operation": op_name,
+                "success": success,
+            },
+        )
 
     def _handle_put(self, op: PutOp) -> None:
+        if self.settings.buffered_writes:
+            self._enqueue_write(op)
+            return
         namespace = op.namespace
         index = self.settings.data_index_alias
         doc_id = _document_id(namespace, op.key)
-        existed = self._doc_exists(doc_id)
 
+        # The write response tells us whether the doc was created/deleted, so the
+        # namespace counter needs no `exists` round-trip.
         if op.value is None:
-            if existed:
-                self.client.delete(index=index, id=doc_id, ignore=[404])
+            resp = self.client.delete(index=index, id=doc_id, ignore=[404])
+            if _write_result(resp) == "deleted":
                 self._update_namespace_stats(namespace, delta=-1)
-            return None
+            return
 
         ttl_minutes = self._resolve_ttl_minutes(op.ttl)
         payload = self._document_body(namespace, op.key, op.value, ttl_minutes=ttl_minutes)
-        self.client.index(index=index, id=doc_id, document=payload)
-        self._update_namespace_stats(namespace, delta=0 if existed else 1)
-        return None
+        resp = self.client.index(index=index, id=doc_id, document=payload)
+        self._update_namespace_stats(namespace, delta=1 if _write_result(resp) == "created" else 0)
 
     def _handle_get(self, op: GetOp) -> Item | None:
         index = self.settings.data_index_alias
         doc_id = _document_id(op.namespace, op.key)
         try:
-            resp = self.client.get(index=index, id=doc_id)
-        except Exception:
+            resp = self.client.get(
+                index=index, id=doc_id, _source_excludes=_VECTOR_SOURCE_FIELDS
+            )
+        except TransportError:
             return None
         source = resp.get("_source", {})
         if self._is_expired(source):
-            self.client.delete(index=index, id=doc_id, ignore=[404])
-            self._update_namespace_stats(op.namespace, delta=-1)
+            self._apply_read_maintenance({doc_id: op.namespace}, {})
             return None
         if self._should_refresh_ttl(op.refresh_ttl, source):
             self._refresh_ttl(doc_id, source)
         return self._item_from_source(op.namespace, op.key, source)
 
+    def _handle_gets(self, ops: Sequence[GetOp]) -> list[Item | None]:
+        doc_ids = [_document_id(op.namespace, op.key) for op in ops]
+        try:
+            resp = self.client.mget(
+                index=self.settings.data_index_alias,
+                body={"ids": doc_ids},
+                _source_excludes=_VECTOR_SOURCE_FIELDS,
+            )
+        except TransportError:
+            return [None] * len(ops)
+        items, expired, to_refresh = self._partition_docs(ops, doc_ids, resp)
+        self._apply_read_maintenance(expired, to_refresh)
+        return items
+
+    def _partition_docs(
+        self, ops: Sequence[GetOp], doc_ids: Sequence[str], resp: Mapping[str, Any]
+    ) -> tuple[list[Item | None], dict[str, NamespacePath], dict[str, dict[str, Any]]]:
+        """Split `_mget` docs into items, expired doc ids and docs whose TTL should be refreshed."""
+
+        items: list[Item | None] = []
+        expired: dict[str, NamespacePath] = {}
+        to_refresh: dict[str, dict[str, Any]] = {}
+        docs = resp.get("docs", [])
+        now_iso = _serialize_ts(_now())
+        for position, (op, doc_id) in enumerate(zip(ops, doc_ids)):
+            doc = docs[position] if position < len(docs) else {}
+            source = doc.get("_source") if doc.get("found") else None
+            if source is None:
+                items.append(None)
+                continue
+            if self._is_expired(source, now_iso):
+                expired[doc_id] = op.namespace
+                items.append(None)
+                continue
+            if self._should_refresh_ttl(op.refresh_ttl, source):
+                to_refresh[doc_id] = source
+            items.append(self._item_from_source(op.namespace, op.key, source))
+        return items, expired, to_refresh
+
+    def _read_maintenance_actions(
+        self, expired: Iterable[str], to_refresh: Mapping[str, dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Bulk actions deleting expired docs and extending TTLs of docs just read."""
+
+        index = self.settings.data_index_alias
+        actions: list[dict[str, Any]] = [
+            {"_op_type": "delete", "_index": index, "_id": doc_id} for doc_id in expired
+        ]
+        for doc_id, source in to_refresh.items():
+            body = self._ttl_refresh_body(source)
+            if body is not None:
+                actions.append({"_op_type": "update", "_index": index, "_id": doc_id, "_source": body})
+        return actions
+
     def _handle_search(self, op: SearchOp) -> list[SearchItem]:
-        mode = self._determine_search_mode(op.query)
-        filters = self._build_filters(op.namespace_prefix, op.filter)
-        hits: list[dict[str, Any]]
-        if mode == "vector":
-            hits = self._vector_search(op.query, filters, op.limit, op.offset)
-        elif mode == "hybrid":
-            hits = self._hybrid_search(op.query, filters, op.limit, op.offset)
-        else:
-            hits = self._text_search(op.query, filters, op.limit, op.offset)
+        hits = self._search_hits(op.namespace_prefix, op.query, op.filter, op.limit, op.offset)
         return self._hits_to_items(hits, op.refresh_ttl)
 
+    def _handle_searches(self, ops: Sequence[SearchOp]) -> list[list[SearchItem]]:
+        """Run several `SearchOp`s, each with its own filters and paging, in one `_msearch`."""
+
+        modes = [self._determine_search_mode(op.query) for op in ops]
+        queries = [op.query for op in ops]
+        positions = self._embed_positions(queries, modes)
+        vectors: dict[int, Sequence[float]] = {}
+        if positions:
+            embedded = self._embed_queries([queries[i] or "" for i in positions])
+            vectors = dict(zip(positions, embedded))
+        bodies, plans = self._plan_op_searches(ops, modes, vectors)
+        hit_lists = self._collect_op_searches(ops, plans, self._msearch(bodies))
+        return self._hit_lists_to_items(hit_lists, [op.refresh_ttl for op in ops])
+
+    def _plan_op_searches(
+        self,
+        ops: Sequence[SearchOp],
+        modes: Sequence[str],
+        vectors: Mapping[int, Sequence[float]],
+    ) -> tuple[list[dict[str, Any]], list[tuple[int, list[tuple[str, int, int | None]]]]]:
+        bodies: list[dict[str, Any]] = []
+        plans: list[tuple[int, list[tuple[str, int, int | None]]]] = []
+        now = _serialize_ts(_now())
+        for position, (op, mode) in enumerate(zip(ops, modes)):
+            filters = self._build_filters(op.namespace_prefix, op.filter, now=now)
+            vector = {0: vectors[position]} if position in vectors else {}
+            op_bodies, plan = self._plan_searches(
+                [op.query], [mode], vector, filters, op.limit, op.offset
+            )
+            plans.append((len(bodies), plan))
+            bodies.extend(op_bodies)
+        return bodies, plans
+
+    def _collect_op_searches(
+        self,
+        ops: Sequence[SearchOp],
+        plans: Sequence[tuple[int, list[tuple[str, int, int | None]]]],
+        responses: list[list[dict[str, Any]]],
+    ) -> list[list[dict[str, Any]]]:
+        return [
+            self._collect_searches(plan, responses[start:], op.limit, op.offset)[0]
+            for op, (start, plan) in zip(ops, plans)
+        ]
+
+    def _search_hits(
+        self,
+        namespace_prefix: NamespacePath,
+        query: str | None,
+        metadata_filter: Mapping[str, Any] | None,
+        limit: int,
+        offset: int,
+    ) -> list[dict[str, Any]]:
+        """Run one search; hybrid queries embed once and send both legs in one `_msearch`."""
+
+        filters = self._build_filters(namespace_prefix, metadata_filter)
+        mode = self._determine_search_mode(query)
+        vectors: dict[int, Sequence[float]] = {}
+        if query and self._embed_positions([query], [mode]):
+            vectors[0] = self._embed_query(query)
+            if mode == "vector" and not metadata_filter and self.settings.local_vector_cache:
+                local = self._local_vector_hits(namespace_prefix, vectors[0], limit, offset)
+                if local is not None:
+                    return local
+        bodies, plan = self._plan_searches([query], [mode], vectors, filters, limit, offset)
+        if len(bodies) == 1:
+            resp = self.client.search(index=self.settings.data_index_alias, body=bodies[0])
+            responses = [resp.get("hits", {}).get("hits", [])]
+        else:
+            responses = self._msearch(bodies)
+        return self._collect_searches(plan, responses, limit, offset)[0]
+
+    def _local_vector_hits(
+        self,
+        namespace: NamespacePath,
+        vector: Sequence[float],
+        limit: int,
+        offset: int,
+    ) -> list[dict[str, Any]] | None:
+        """Exact cosine kNN over a namespace's cached vectors; None falls back to the server."""
+
+        cached = self._namespace_vectors(namespace)
+        if cached is None:
+            return None
+        matrix, hits = cached
+        size = min(limit + offset, len(hits))
+        if size == 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return None
+        cosine = np.clip(matrix @ (query / norm), -1.0, 1.0)
+        top = np.argpartition(-cosine, size - 1)[:size]
+        top = top[np.argsort(-cosine[top], kind="stable")][offset:]
+        threshold = self.settings.search_similarity_threshold
+        results: list[dict[str, Any]] = []
+        for position in top:
+            # Same scale as the server's cosinesimil score.
+            score = (1.0 + float(cosine[position])) / 2.0
+            if threshold is None or score >= threshold:
+                results.append({**hits[position], "_score": score})
+        return results
+
+    def _namespace_vectors(
+        self, namespace: NamespacePath
+    ) -> tuple[np.ndarray, list[dict[str, Any]]] | None:
+        key = _namespace_key(namespace)
+        now = time.monotonic()
+        with self._vector_cache_lock:
+            entry = self._vector_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        loaded = self._load_namespace_vectors(namespace)
+        lifetime = self.settings.local_vector_cache_ttl_seconds
+        if loaded is not None:
+            # Reload once the first cached document's TTL lapses, as the server would drop it.
+            expiries = [hit["_source"].get("ttl_expires_at") for hit in loaded[1]]
+            if any(expiries):
+                earliest = min(_parse_ts(raw) for raw in expiries if raw)
+                lifetime = min(lifetime, (earliest - _now()).total_seconds())
+        with self._vector_cache_lock:
+            self._vector_cache[key] = (now + lifetime, loaded)
+        return loaded
+
+    def _load_namespace_vectors(
+        self, namespace: NamespacePath
+    ) -> tuple[np.ndarray, list[dict[str, Any]]] | None:
+        index = self.settings.data_index_alias
+        query = {
+            "bool": {
+                "filter": [
+                    _namespace_term(tuple(namespace), self.settings.namespace_hash_filter),
+                    self._ttl_filter_clause(),
+                ]
+            }
+        }
+        count = self.client.count(index=index, body={"query": query}).get("count", 0)
+        if count > self.settings.local_vector_cache_max_docs:
+            return None
+        hits: list[dict[str, Any]] = []
+        vectors: list[Any] = []
+        field = self._embedding_field
+        for hit in helpers.scan(self.client, index=index, query={"query": query}, size=1000):
+            source = dict(hit.get("_source", {}))
+            vector = source.pop(field, None)
+            if vector is None:
+                continue
+            hits.append({"_id": hit.get("_id"), "_source": source})
+            vectors.append(vector)
+        if not vectors:
+            return np.empty((0, self.settings.embedding_dim), dtype=np.float32), []
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix /= np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+        return matrix, hits
+
+    def _invalidate_namespace_vectors(self, namespaces: Iterable[NamespacePath]) -> None:
+        if not self.settings.local_vector_cache:
+            return
+        with self._vector_cache_lock:
+            for namespace in namespaces:
+                self._vector_cache.pop(_namespace_key(namespace), None)
+
+    async def _a_handle_put(self, op: PutOp) -> None:
+        client = self.async_client
+        namespace = op.namespace
+        index = self.settings.data_index_alias
+        doc_id = _document_id(namespace, op.key)
+
+        if op.value is None:
+            resp = await client.delete(index=index, id=doc_id, ignore=[404])
+            if _write_result(resp) == "deleted":
+                await self._a_update_namespace_stats(namespace, delta=-1)
+            return
+
+        ttl_minutes = self._resolve_ttl_minutes(op.ttl)
+        payload = self._document_body(
+            namespace, op.key, op.value, ttl_minutes=ttl_minutes, embed=False
+        )
+        text = self._extract_text(op.value) if self._embeddings is not None else None
+        if text and self._embeddings is not None:
+            try:
+                vector = await self._a_embed_query(text)
+            except Exception:  # pragma: no cover - provider failures
+                logger.warning("embedding_failure", exc_info=True)
+                vector = None
+            self._attach_embedding(payload, vector, namespace, op.key)
+        resp = await client.index(index=index, id=doc_id, document=payload)
+        await self._a_update_namespace_stats(
+            namespace, delta=1 if _write_result(resp) == "created" else 0
+        )
+
+    async def _a_handle_get(self, op: GetOp) -> Item | None:
+        client = self.async_client
+        index = self.settings.data_index_alias
+        doc_id = _document_id(op.namespace, op.key)
+        try:
+            resp = await client.get(
+                index=index, id=doc_id, _source_excludes=_VECTOR_SOURCE_FIELDS
+            )
+        except TransportError:
+            return None
+        source = resp.get("_source", {})
+        if self._is_expired(source):
+            await self._a_apply_read_maintenance({doc_id: op.namespace}, {})
+            return None
+        if self._should_refresh_ttl(op.refresh_ttl, source):
+            await self._a_refresh_ttl(doc_id, source)
+        return self._item_from_source(op.namespace, op.key, source)
+
+    async def _a_handle_gets(self, ops: Sequence[GetOp]) -> list[Item | None]:
+        doc_ids = [_document_id(op.namespace, op.key) for op in ops]
+        try:
+            resp = await self.async_client.mget(
+                index=self.settings.data_index_alias,
+                body={"ids": doc_ids},
+                _source_excludes=_VECTOR_SOURCE_FIELDS,
+            )
+        except TransportError:
+            return [None] * len(ops)
+        items, expired, to_refresh = self._partition_docs(ops, doc_ids, resp)
+        await self._a_apply_read_maintenance(expired, to_refresh)
+        return items
+
+    async def _a_handle_search(self, op: SearchOp) -> list[SearchItem]:
+        hit_lists = await self._a_search_hits(
+            op.namespace_prefix, [op.query], op.filter, op.limit, op.offset
+        )
+        return await self._a_hits_to_items(hit_lists[0], op.refresh_ttl)
+
+    async def _a_handle_searches(self, ops: Sequence[SearchOp]) -> list[list[SearchItem]]:
+        modes = [self._determine_search_mode(op.query) for op in ops]
+        queries = [op.query for op in ops]
+        positions = self._embed_positions(queries, modes)
+        vectors: dict[int, Sequence[float]] = {}
+        if positions:
+            embedded = await self._a_embed_queries([queries[i] or "" for i in positions])
+            vectors = dict(zip(positions, embedded))
+        bodies, plans = self._plan_op_searches(ops, modes, vectors)
+        resp = await self.async_client.msearch(
+            body=self._msearch_lines(bodies), index=self.settings.data_index_alias
+        )
+        hit_lists = self._collect_op_searches(ops, plans, self._parse_msearch(resp, len(bodies)))
+        return await self._a_hit_lists_to_items(hit_lists, [op.refresh_ttl for op in ops])
+
+    async def _a_search_hits(
+        self,
+        namespace_prefix: NamespacePath,
+        queries: Sequence[str | None],
+        metadata_filter: Mapping[str, Any] | None,
+        limit: int,
+        offset: int,
+    ) -> list[list[dict[str, Any]]]:
+        filters = self._build_filters(namespace_prefix, metadata_filter)
+        modes = [self._determine_search_mode(query) for query in queries]
+        positions = self._embed_positions(queries, modes)
+        vectors: dict[int, Sequence[float]] = {}
+        if positions:
+            embedded = await self._a_embed_queries([queries[i] or "" for i in positions])
+            vectors = dict(zip(positions, embedded))
+        bodies, plan = self._plan_searches(queries, modes, vectors, filters, limit, offset)
+        client = self.async_client
+        index = self.settings.data_index_alias
+        if len(bodies) == 1:
+            resp = await client.search(index=index, body=bodies[0])
+            responses = [resp.get("hits", {}).get("hits", [])]
+        else:
+            resp = await client.msearch(body=self._msearch_lines(bodies), index=index)
+            responses = self._parse_msearch(resp, len(bodies))
+        return self._collect_searches(plan, responses, limit, offset)
+
+    def _write_entries(
+        self,
+        entries: Sequence[_BufferedWrite],
+        *,
+        vectors: Sequence[Sequence[float] | None] | None = None,
+        raise_on_failure: bool = False,
+    ) -> int:
+        """Embed and bulk-index entries, then apply one stats update per namespace.
+
+        `vectors` may carry embeddings already computed for the non-delete entries. Failed
+        items are logged, or raised as `BulkIndexError` with `raise_on_failure=True`.
+        """
+
+        if vectors is None:
+            vectors = self._embed_values([value for _, _, value, _ in entries if value is not None])
+        actions, namespaces = self._bulk_actions(entries, vectors)
+        with self._refresh_paused(len(actions) >= self.settings.bulk_pause_refresh_threshold):
+            results = list(self._bulk(actions))
+        self._apply_namespace_deltas(self._bulk_deltas(results, namespaces))
+        if raise_on_failure:
+            errors = [result for ok, result in results if _bulk_item_failed(ok, result)]
+            if errors:
+                raise helpers.BulkIndexError(f"{len(errors)} document(s) failed to index.", errors)
+        return len(actions)
+
+    async def _a_write_entries(
+        self,
+        entries: Sequence[_BufferedWrite],
+        vectors: Sequence[Sequence[float] | None],
+    ) -> int:
+        actions, namespaces = self._bulk_actions(entries, vectors)
+        async with self._a_refresh_paused(
+            len(actions) >= self.settings.bulk_pause_refresh_threshold
+        ):
+            results = await self._a_bulk(actions)
+        await self._a_apply_namespace_deltas(self._bulk_deltas(results, namespaces))
+        return len(actions)
+
+    def _bulk_actions(
+        self,
+        entries: Sequence[_BufferedWrite],
+        vectors: Sequence[Sequence[float] | None],
+    ) -> tuple[list[dict[str, Any]], dict[str, NamespacePath]]:
+        index = self.settings.data_index_alias
+        vector_iter = iter(vectors)
+        namespaces: dict[str, NamespacePath] = {}
+        actions: list[dict[str, Any]] = []
+        for namespace, key, value, ttl_minutes in entries:
+            doc_id = _document_id(namespace, key)
+            namespaces[doc_id] = namespace
+            if value is None:
+                actions.append({"_op_type": "delete", "_index": index, "_id": doc_id})
+                continue
+            payload = self._document_body(
+                namespace, key, value, ttl_minutes=ttl_minutes, embed=False
+            )
+            self._attach_embedding(payload, next(vector_iter), namespace, key)
+            actions.append({"_op_type": "index", "_index": index, "_id": doc_id, "_source": payload})
+        return actions, namespaces
+
+    def _bulk_deltas(
+        self,
+        results: Sequence[tuple[bool, dict[str, Any]]],
+        namespaces: Mapping[str, NamespacePath],
+    ) -> dict[NamespacePath, int]:
+        """Turn per-item bulk results into document-count deltas per namespace."""
+
+        deltas: dict[NamespacePath, int] = {}
+        failures = 0
+        for ok, result in results:
+            op_type, info = next(iter(result.items()))
+            if not ok:
+                failures += _bulk_item_failed(ok, result)
+                continue
+            namespace = namespaces.get(info.get("_id", ""))
+            if namespace is None:
+                continue
+            delta = deltas.setdefault(namespace, 0)
+            if op_type == "index" and info.get("result") == "created":
+                deltas[namespace] = delta + 1
+            elif op_type == "delete" and info.get("result") == "deleted":
+                deltas[namespace] = delta - 1
+        if failures:
+            logger.warning("bulk_failure", extra={"failed": failures, "total": len(results)})
+        return deltas
+
+    async def _a_bulk(self, actions: Iterable[dict[str, Any]]) -> list[tuple[bool, dict[str, Any]]]:
+        return [
+            result
+            async for result in helpers.async_streaming_bulk(
+                self.async_client,
+                actions,
+                chunk_size=BULK_CHUNK_SIZE,
+                max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+                max_retries=3,
+                initial_backoff=2,
+                raise_on_error=False,
+                raise_on_exception=False,
+            )
+        ]
+
+    def _bulk(self, actions: Iterable[dict[str, Any]]) -> Iterable[tuple[bool, dict[str, Any]]]:
+        return helpers.streaming_bulk(
+            self.client,
+            actions,
+            chunk_size=BULK_CHUNK_SIZE,
+            max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+            max_retries=3,
+            initial_backoff=2,
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+
+    def _enqueue_write(self, op: PutOp) -> None:
+        error, self._background_flush_error = self._background_flush_error, None
+        if error is not None:
+            raise error
+        (entry,) = self._put_entries([op])
+        with self._flush_lock:
+            # Re-inserting moves the key to the end, so the flush sends it in arrival order.
+            self._bulk_buffer.pop((entry[0], entry[1]), None)
+            self._bulk_buffer[(entry[0], entry[1])] = entry
+            now = time.monotonic()
+            if self._buffer_started is None:
+                self._buffer_started = now
+            due = (
+                len(self._bulk_buffer) >= self.settings.index_batch_size
+                or now - self._buffer_started >= self.settings.index_flush_interval
+            )
+            if not due and self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    self.settings.index_flush_interval, self._flush_in_background
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if due:
+            self.flush()
+
+    @contextmanager
+    def _refresh_paused(self, enabled: bool) -> Iterator[None]:
+        """Disable index refreshes on the data alias while a large bulk load runs.
+
+        Concurrent loads share one pause: the first reads each backing index's current
+        `refresh_interval` and the last one out restores exactly those values. The lock
+        only guards that bookkeeping; the settings calls run outside it. A failed pause is
+        logged and the load runs with refreshes on.
+        """
+
+        if not enabled or self.settings.aws_service == "aoss":
+            yield
+            return
+        index = self.settings.data_index_alias
+        step = self._join_refresh_pause()
+        try:
+            if step is not None:
+                try:
+                    if step == "read":
+                        current = self.client.indices.get_settings(
+                            index=index, name="index.refresh_interval"
+                        )
+                        self._record_refresh_intervals(_refresh_intervals(current))
+                    self.client.indices.put_settings(
+                        index=index, body={"index": {"refresh_interval": "-1"}}
+                    )
+                except TransportError:
+                    logger.warning("refresh_pause_failure", exc_info=True)
+            yield
+        finally:
+            intervals = self._leave_refresh_pause()
+            if intervals is not None:
+                try:
+                    for name, interval in intervals.items():
+                        self.client.indices.put_settings(
+                            index=name, body={"index": {"refresh_interval": interval}}
+                        )
+                finally:
+                    self._finish_refresh_restore()
+
+    @asynccontextmanager
+    async def _a_refresh_paused(self, enabled: bool) -> AsyncIterator[None]:
+        if not enabled or self.settings.aws_service == "aoss":
+            yield
+            return
+        client = self.async_client
+        index = self.settings.data_index_alias
+        step = self._join_refresh_pause()
+        # Joined before the first await: a cancellation anywhere below still leaves the
+        # pause and, if last, restores the saved intervals.
+        try:
+            if step is not None:
+                try:
+                    if step == "read":
+                        current = await client.indices.get_settings(
+                            index=index, name="index.refresh_interval"
+                        )
+                        self._record_refresh_intervals(_refresh_intervals(current))
+                    await client.indices.put_settings(
+                        index=index, body={"index": {"refresh_interval": "-1"}}
+                    )
+                except TransportError:
+                    logger.warning("refresh_pause_failure", exc_info=True)
+            yield
+        finally:
+            intervals = self._leave_refresh_pause()
+            if intervals is not None:
+                try:
+                    for name, interval in intervals.items():
+                        await client.indices.put_settings(
+                            index=name, body={"index": {"refresh_interval": interval}}
+                        )
+                finally:
+                    self._finish_refresh_restore()
+
+    # Refresh-pause bookkeeping, shared by the sync and async paths. Each step holds the
+    # lock only to update the counter and saved intervals, never across a request.
+    def _join_refresh_pause(self) -> Literal["read", "pause"] | None:
+        """Count a new pauser; return the request it must make, if it is the first."""
+
+        with self._refresh_pause_lock:
+            self._refresh_pausers += 1
+            if self._refresh_pausers > 1:
+                return None
+            # Intervals still saved mean the previous restore hasn't finished; reading now
+            # could capture our own "-1".
+            return "read" if self._paused_refresh_intervals is None else "pause"
+
+    def _record_refresh_intervals(self, intervals: dict[str, Any]) -> None:
+        with self._refresh_pause_lock:
+            self._paused_refresh_intervals = intervals
+
+    def _leave_refresh_pause(self) -> dict[str, Any] | None:
+        """Uncount a pauser; the last one gets the intervals it must restore."""
+
+        with self._refresh_pause_lock:
+            self._refresh_pausers -= 1
+            if self._refresh_pausers:
+                return None
+            return self._paused_refresh_intervals
+
+    def _finish_refresh_restore(self) -> None:
+        with self._refresh_pause_lock:
+            if self._refresh_pausers == 0:
+                self._paused_refresh_intervals = None
+
     def _document_body(
         self,
         namespace: NamespacePath,
@@ -319,37 +1579,140 @@ class OpenSearchStore(BaseStore):
         value: Mapping[str, Any],
         *,
         ttl_minutes: float | None = None,
+        embed: bool = True,
     ) -> dict[str, Any]:
         now = _now()
+        now_iso = _serialize_ts(now)
         body = {
             "namespace": list(namespace),
             "namespace_key": _namespace_key(namespace),
+            "namespace_hash": _namespace_hash(tuple(namespace)),
             "depth": len(namespace),
             "key": key,
             "doc": dict(value),
-            "created_at": _serialize_ts(now),
-            "updated_at": _serialize_ts(now),
+            "created_at": now_iso,
+            "updated_at": now_iso,
         }
-        expires_at = _compute_ttl_expires(ttl_minutes)
+        expires_at = _compute_ttl_expires(ttl_minutes, now=now)
         if expires_at is not None:
             body["ttl_expires_at"] = expires_at
             body["ttl_minutes"] = ttl_minutes
-        if self._embeddings is not None:
+        if embed and self._embeddings is not None:
             text = self._extract_text(value)
             if text:
                 try:
-                    embedding_vector = self._embeddings.embed_query(text)
+                    embedding_vector = self._embed_query(text)
                 except Exception:  # pragma: no cover - provider failures
                     logger.warning("embedding_failure", exc_info=True)
                     embedding_vector = None
-                if embedding_vector:
-                    body["embedding"] = embedding_vector
-                else:
-                    logger.debug(
-                        "embedding_skip", extra={"namespace": namespace, "key": key}
-                    )
+                self._attach_embedding(body, embedding_vector, namespace, key)
         return body
 
+    def _attach_embedding(
+        self,
+        body: dict[str, Any],
+        vector: Sequence[float] | None,
+        namespace: NamespacePath,
+        key: str,
+    ) -> None:
+        if vector:
+            body["embedding"] = self._encode_vector(vector)
+            if self.settings.vector_quantization == "byte":
+                body["embedding_scale"] = _int8_scale(vector)
+        else:
+            logger.debug("embedding_skip", extra={"namespace": namespace, "key": key})
+
+    def _encode_vector(self, vector: Sequence[float]) -> Any:
+        """Encode a vector for a request body, quantizing to bytes for `data_type: byte`.
+
+        With the orjson serializer the vector stays a float32/int8 ndarray all the way
+        to the wire; otherwise a plain list is sent.
+        """
+
+        if self.settings.vector_quantization == "byte":
+            quantized = _quantize_int8(vector)
+            return quantized if self._numpy_vectors else quantized.tolist()
+        if self._numpy_vectors:
+            return np.asarray(vector, dtype=np.float32)
+        return vector
+
+    @property
+    def _numpy_vectors(self) -> bool:
+        if self._numpy_bodies is None:
+            serializer = getattr(getattr(self.client, "transport", None), "serializer", None)
+            self._numpy_bodies = isinstance(serializer, _OrjsonSerializer)
+        return self._numpy_bodies
+
+    def _embed_query(self, text: str) -> list[float]:
+        """Embed one query/document text; repeats are served by the embedding cache."""
+
+        return self._require_embeddings().embed_query(text)
+
+    async def _a_embed_query(self, text: str) -> list[float]:
+        return await self._require_embeddings().aembed_query(text)
+
+    def _embed_queries(self, texts: Sequence[str]) -> list[list[float]]:
+        """Embed several search queries as queries, not documents, one `embed_query` each."""
+
+        vectors = {text: self._embed_query(text) for text in dict.fromkeys(texts)}
+        return [vectors[text] for text in texts]
+
+    async def _a_embed_queries(self, texts: Sequence[str]) -> list[list[float]]:
+        unique = list(dict.fromkeys(texts))
+        embedded = await asyncio.gather(*(self._a_embed_query(text) for text in unique))
+        vectors = dict(zip(unique, embedded))
+        return [vectors[text] for text in texts]
+
+    def _require_embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            msg = "An embeddings provider is required to embed text"
+            raise RuntimeError(msg)
+        return self._embeddings
+
+    def _embed_values(self, values: Sequence[Mapping[str, Any]]) -> list[list[float] | None]:
+        """Embed the text of each value with one `embed_documents` round-trip."""
+
+        vectors: list[list[float] | None] = [None] * len(values)
+        positions, texts = self._embedding_texts(values)
+        if not texts or self._embeddings is None:
+            return vectors
+        try:
+            embedded = self._embeddings.embed_documents(texts)
+        except Exception:  # pragma: no cover - provider failures
+            logger.warning("embedding_failure", exc_info=True)
+            return vectors
+        for position, vector in zip(positions, embedded):
+            vectors[position] = vector
+        return vectors
+
+    async def _a_embed_values(
+        self, values: Sequence[Mapping[str, Any]]
+    ) -> list[list[float] | None]:
+        vectors: list[list[float] | None] = [None] * len(values)
+        positions, texts = self._embedding_texts(values)
+        if not texts or self._embeddings is None:
+            return vectors
+        try:
+            embedded = await self._embeddings.aembed_documents(texts)
+        except Exception:  # pragma: no cover - provider failures
+            logger.warning("embedding_failure", exc_info=True)
+            return vectors
+        for position, vector in zip(positions, embedded):
+            vectors[position] = vector
+        return vectors
+
+    def _embedding_texts(self, values: Sequence[Mapping[str, Any]]) -> tuple[list[int], list[str]]:
+        positions: list[int] = []
+        texts: list[str] = []
+        if self._embeddings is None:
+            return positions, texts
+        for position, value in enumerate(values):
+            text = self._extract_text(value)
+            if text:
+                positions.append(position)
+                texts.append(text)
+        return positions, texts
+
     def _extract_text(self, value: Mapping[str, Any]) -> str | None:
         for candidate in ("text", "body", "content"):
             maybe = value.get(candidate)
@@ -359,121 +1722,304 @@ class OpenSearchStore(BaseStore):
 
     def _determine_search_mode(self, query: str | None) -> Literal["text", "vector", "hybrid"]:
         configured = self.settings.search_mode
-        if configured != "auto":
-            return "hybrid" if configured == "hybrid" else configured  # type: ignore[return-value]
-        if query and self._embeddings is not None:
-            return "hybrid"
-        return "text"
+        if configured == "auto":
+            mode = "hybrid" if query and self._embeddings is not None else "text"
+        else:
+            mode = configured
+        if (
+            mode == "hybrid"
+            and self.settings.hybrid_auto_fallback
+            and query
+            and self._embeddings is not None
+            and len(query.split()) < HYBRID_FALLBACK_MAX_TERMS
+        ):
+            # One- or two-word queries gain little from BM25; skip the second
+            # sub-query and the fusion step.
+            return "vector"
+        return mode  # type: ignore[return-value]
+
+    def _build_filters(
+        self,
+        namespace: NamespacePath,
+        metadata_filter: Mapping[str, Any] | None,
+        *,
+        now: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Filter clauses for one search; batches pass one serialized `now` for every op."""
 
-    def _build_filters(self, namespace: NamespacePath, metadata_filter: Mapping[str, Any] | None) -> list[dict[str, Any]]:
         filters: list[dict[str, Any]] = [
-            {"term": {"namespace_key": _namespace_key(namespace)}}
+            _namespace_term(tuple(namespace), self.settings.namespace_hash_filter),
+            self._ttl_filter_clause(now),
         ]
-        ttl_filter = self._ttl_filter_clause()
-        if ttl_filter is not None:
-            filters.append(ttl_filter)
         if metadata_filter:
             for key, value in metadata_filter.items():
                 filters.append({"term": {f"doc.{key}": value}})
         return filters
 
-    def _ttl_filter_clause(self) -> dict[str, Any] | None:
-        if self.settings.ttl_minutes_default is None and not self.settings.ttl_refresh_on_read:
-            # TTL disabled globally; filters still needed when doc has ttl but easiest is to always allow both
-            pass
-        return {
-            "bool": {
-                "should": [
-                    {"bool": {"must_not": {"exists": {"field": "ttl_expires_at"}}}},
-                    {"range": {"ttl_expires_at": {"gt": _serialize_ts(_now())}}},
-                ],
-                "minimum_should_match": 1,
-            }
-        }
+    def _ttl_filter_clause(self, now: str | None = None) -> dict[str, Any]:
+        # Docs without a TTL always match, so the clause is applied even when TTLs are off.
+        return _ttl_live_clause(now or _serialize_ts(_now()))
 
-    def _text_search(
+    def _text_search_body(
         self,
         query: str | None,
         filters: list[dict[str, Any]],
         limit: int,
         offset: int,
-    ) -> list[dict[str, Any]]:
+    ) -> dict[str, Any]:
         must_clause: dict[str, Any]
         if query:
             must_clause = {"match": {"doc": query}}
         else:
             must_clause = {"match_all": {}}
-        body = {
+        return {
             "from": offset,
             "size": limit,
             "query": {"bool": {"must": must_clause, "filter": filters}},
+            "_source": _NO_VECTOR_SOURCE,
         }
-        resp = self.client.search(index=self.settings.data_index_alias, body=body)
-        return resp.get("hits", {}).get("hits", [])
 
-    def _vector_search(
+    def _knn_search_body(
         self,
-        query: str | None,
+        vector: Sequence[float],
         filters: list[dict[str, Any]],
-        limit: int,
-        offset: int,
-    ) -> list[dict[str, Any]]:
-        if self._embeddings is None or not query:
-            return self._text_search(query, filters, limit, offset)
-        vector = self._embeddings.embed_query(query)
-        size = limit + offset
+        size: int,
+    ) -> dict[str, Any]:
         knn_payload = {
-            "vector": vector,
+            "vector": self._encode_vector(vector),
             "k": size,
             "num_candidates": max(size * 2, self.settings.search_num_candidates),
         }
         if self.settings.search_similarity_threshold is not None:
             knn_payload["similarity_cutoff"] = self.settings.search_similarity_threshold
-        body = {"size": size}
+        body: dict[str, Any] = {"size": size, "_source": _NO_VECTOR_SOURCE}
         self._apply_knn_query(body, knn_payload, filters)
-        resp = self.client.search(index=self.settings.data_index_alias, body=body)
-        hits = resp.get("hits", {}).get("hits", [])
-        return hits[offset:offset + limit]
+        return body
 
-    def _hybrid_search(
+    def _mmr_search_body(
         self,
-        query: str | None,
+        vector: Sequence[float],
         filters: list[dict[str, Any]],
+        size: int,
+    ) -> dict[str, Any]:
+        fetch_k = max(size, min(size * 3, self.settings.search_num_candidates))
+        body = self._knn_search_body(vector, filters, fetch_k)
+        # The re-rank compares candidates against each other, so it needs their vectors.
+        body["_source"] = True
+        return body
+
+    def _mmr_rerank(
+        self,
+        vector: Sequence[float],
+        hits: list[dict[str, Any]],
+        mmr_lambda: float,
         limit: int,
         offset: int,
     ) -> list[dict[str, Any]]:
-        text_hits = self._text_search(query, filters, limit + offset, 0)
-        vector_hits = self._vector_search(query, filters, limit + offset, 0)
-        scores: dict[str, float] = {}
-        hits: dict[str, dict[str, Any]] = {}
+        field = self._embedding_field
+        embedded: list[dict[str, Any]] = []
+        # Hits without a stored vector cannot be compared; keep them after the re-ranked ones.
+        remainder: list[dict[str, Any]] = []
+        for hit in hits:
+            (embedded if hit.get("_source", {}).get(field) else remainder).append(hit)
+        order = mmr_order(
+            vector,
+            [hit["_source"][field] for hit in embedded],
+            lambda_mult=mmr_lambda,
+            k=limit + offset,
+        )
+        ranked = [embedded[i] for i in order] + remainder
+        return ranked[offset:offset + limit]
 
-        def rank_items(items: list[dict[str, Any]], weight: float) -> None:
+    def _fuse_hits(
+        self,
+        text_hits: list[dict[str, Any]],
+        vector_hits: list[dict[str, Any]],
+        limit: int,
+        offset: int,
+    ) -> list[dict[str, Any]]:
+        """Blend BM25 and kNN rankings with reciprocal-rank fusion."""
+
+        scores: defaultdict[str, float] = defaultdict(float)
+        hits: dict[str, dict[str, Any]] = {}
+        for items in (text_hits, vector_hits):
             for rank, hit in enumerate(items, start=1):
                 doc_id = hit.get("_id") or hit.get("_source", {}).get("key")
-                if not doc_id:
-                    continue
-                hits[doc_id] = hit
-                scores[doc_id] = scores.get(doc_id, 0.0) + weight / (rank + 1)
+                if doc_id:
+                    hits[doc_id] = hit
+                    scores[doc_id] += 1.0 / (RRF_RANK_CONSTANT + rank)
+        # nlargest keeps sorted()'s tie order but skips sorting the tail past the page.
+        top = heapq.nlargest(offset + limit, scores.items(), key=itemgetter(1))
+        return [hits[doc_id] for doc_id, _ in top[offset:]]
+
+    def _embed_positions(
+        self,
+        queries: Sequence[str | None],
+        modes: Sequence[str],
+    ) -> list[int]:
+        if self._embeddings is None:
+            return []
+        return [
+            position
+            for position, (query, mode) in enumerate(zip(queries, modes))
+            if mode != "text" and query
+        ]
+
+    def _plan_searches(
+        self,
+        queries: Sequence[str | None],
+        modes: Sequence[str],
+        vectors: Mapping[int, Sequence[float]],
+        filters: list[dict[str, Any]],
+        limit: int,
+        offset: int,
+    ) -> tuple[list[dict[str, Any]], list[tuple[str, int, int | None]]]:
+        """Build the search bodies for each query plus a plan mapping bodies back to queries."""
 
-        rank_items(text_hits, weight=1.0)
-        rank_items(vector_hits, weight=1.0)
-        ranked_ids = sorted(scores, key=lambda doc_id: scores[doc_id], reverse=True)
-        sliced = ranked_ids[offset: offset + limit]
-        return [hits[doc_id] for doc_id in sliced]
+        size = limit + offset
+        bodies: list[dict[str, Any]] = []
+        plan: list[tuple[str, int, int | None]] = []
+        for position, (query, mode) in enumerate(zip(queries, modes)):
+            vector = vectors.get(position)
+            if vector is None:
+                plan.append(("text", len(bodies), None))
+                bodies.append(self._text_search_body(query, filters, limit, offset))
+            elif mode == "vector":
+                plan.append(("vector", len(bodies), None))
+                bodies.append(self._knn_search_body(vector, filters, size))
+            else:
+                plan.append(("hybrid", len(bodies), len(bodies) + 1))
+                bodies.append(self._text_search_body(query, filters, size, 0))
+                bodies.append(self._knn_search_body(vector, filters, size))
+        return bodies, plan
+
+    def _collect_searches(
+        self,
+        plan: Sequence[tuple[str, int, int | None]],
+        responses: list[list[dict[str, Any]]],
+        limit: int,
+        offset: int,
+    ) -> list[list[dict[str, Any]]]:
+        size = limit + offset
+        results: list[list[dict[str, Any]]] = []
+        for kind, first, second in plan:
+            hits = responses[first]
+            if kind == "vector":
+                hits = hits[offset:offset + limit]
+            elif kind == "hybrid" and second is not None:
+                hits = self._fuse_hits(hits, responses[second][:size], limit, offset)
+            results.append(hits)
+        return results
+
+    def _msearch(self, bodies: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """Send search bodies as one NDJSON `_msearch` and return the hits per body."""
+
+        if not bodies:
+            return []
+        resp = self.client.msearch(
+            body=self._msearch_lines(bodies), index=self.settings.data_index_alias
+        )
+        return self._parse_msearch(resp, len(bodies))
+
+    def _msearch_lines(self, bodies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        lines: list[dict[str, Any]] = []
+        for body in bodies:
+            lines.append({})
+            lines.append(body)
+        return lines
+
+    def _parse_msearch(self, resp: Mapping[str, Any], count: int) -> list[list[dict[str, Any]]]:
+        hits: list[list[dict[str, Any]]] = []
+        for response in resp.get("responses", []):
+            if "error" in response:
+                logger.warning("msearch_failure", extra={"error": response["error"]})
+                hits.append([])
+                continue
+            hits.append(response.get("hits", {}).get("hits", []))
+        hits.extend([] for _ in range(count - len(hits)))
+        return hits
 
     def _hits_to_items(self, hits: list[dict[str, Any]], refresh_ttl: bool | None) -> list[SearchItem]:
+        return self._hit_lists_to_items([hits], [refresh_ttl])[0]
+
+    async def _a_hits_to_items(
+        self, hits: list[dict[str, Any]], refresh_ttl: bool | None
+    ) -> list[SearchItem]:
+        return (await self._a_hit_lists_to_items([hits], [refresh_ttl]))[0]
+
+    def _hit_lists_to_items(
+        self,
+        hit_lists: Sequence[list[dict[str, Any]]],
+        refresh_flags: Sequence[bool | None],
+    ) -> list[list[SearchItem]]:
+        """Convert each search's hits, then purge and refresh TTLs for all of them at once."""
+
+        results, expired, to_refresh = self._partition_hit_lists(hit_lists, refresh_flags)
+        self._apply_read_maintenance(expired, to_refresh)
+        return results
+
+    async def _a_hit_lists_to_items(
+        self,
+        hit_lists: Sequence[list[dict[str, Any]]],
+        refresh_flags: Sequence[bool | None],
+    ) -> list[list[SearchItem]]:
+        results, expired, to_refresh = self._partition_hit_lists(hit_lists, refresh_flags)
+        await self._a_apply_read_maintenance(expired, to_refresh)
+        return results
+
+    def _partition_hit_lists(
+        self,
+        hit_lists: Sequence[list[dict[str, Any]]],
+        refresh_flags: Sequence[bool | None],
+    ) -> tuple[list[list[SearchItem]], dict[str, NamespacePath], dict[str, dict[str, Any]]]:
+        results: list[list[SearchItem]] = []
+        expired: dict[str, NamespacePath] = {}
+        to_refresh: dict[str, dict[str, Any]] = {}
+        for hits, refresh_ttl in zip(hit_lists, refresh_flags):
+            items, hit_expired, hit_refresh = self._partition_hits(hits, refresh_ttl)
+            results.append(items)
+            expired.update(hit_expired)
+            to_refresh.update(hit_refresh)
+        return results, expired, to_refresh
+
+    def _apply_read_maintenance(
+        self, expired: Mapping[str, NamespacePath], to_refresh: Mapping[str, dict[str, Any]]
+    ) -> None:
+        """Delete expired docs and extend read docs' TTLs with one `_bulk` request."""
+
+        actions = self._read_maintenance_actions(expired, to_refresh)
+        if actions:
+            results = list(self._bulk(actions))
+            self._apply_namespace_deltas(self._bulk_deltas(results, expired))
+
+    async def _a_apply_read_maintenance(
+        self, expired: Mapping[str, NamespacePath], to_refresh: Mapping[str, dict[str, Any]]
+    ) -> None:
+        actions = self._read_maintenance_actions(expired, to_refresh)
+        if actions:
+            results = await self._a_bulk(actions)
+            await self._a_apply_namespace_deltas(self._bulk_deltas(results, expired))
+
+    def _partition_hits(
+        self, hits: list[dict[str, Any]], refresh_ttl: bool | None
+    ) -> tuple[list[SearchItem], dict[str, NamespacePath], dict[str, dict[str, Any]]]:
+        """Split hits into live items, expired docs and docs whose TTL should be refreshed."""
+
         items: list[SearchItem] = []
+        expired: dict[str, NamespacePath] = {}
+        to_refresh: dict[str, dict[str, Any]] = {}
+        now_iso = _serialize_ts(_now())
         for hit in hits:
             source = hit.get("_source", {})
             doc_id = hit.get("_id")
             namespace = tuple(source.get("namespace", []))
             key = source.get("key", doc_id)
-            if self._is_expired(source):
+            if self._is_expired(source, now_iso):
                 if doc_id:
-                    self.client.delete(index=self.settings.data_index_alias, id=doc_id, ignore=[404])
+                    expired[doc_id] = namespace
                 continue
             if doc_id and self._should_refresh_ttl(refresh_ttl, source):
-                self._refresh_ttl(doc_id, source)
+                to_refresh[doc_id] = source
             item = self._item_from_source(namespace, key, source)
             items.append(
                 SearchItem(
@@ -485,7 +2031,7 @@ class OpenSearchStore(BaseStore):
                     score=hit.get("_score"),
                 )
             )
-        return items
+        return items, expired, to_refresh
 
     def _item_from_source(self, namespace: NamespacePath, key: str, source: dict[str, Any]) -> Item:
         doc = source.get("doc") or {}
@@ -502,6 +2048,7 @@ class OpenSearchStore(BaseStore):
     def _search_body(self, namespace: NamespacePath, query: str, limit: int) -> dict[str, Any]:
         body: dict[str, Any] = {
             "size": limit,
+            "_source": _NO_VECTOR_SOURCE,
             "query": {
                 "bool": {
                     "must": {"match": {"doc": query}},
@@ -510,11 +2057,11 @@ class OpenSearchStore(BaseStore):
             },
         }
         if self._embeddings is not None:
-            vector = self._embeddings.embed_query(query)
+            vector = self._embed_query(query)
             self._apply_knn_query(
                 body,
                 {
-                    "vector": vector,
+                    "vector": self._encode_vector(vector),
                     "k": limit,
                     "num_candidates": max(limit * 4, 20),
                 },
@@ -537,26 +2084,20 @@ class OpenSearchStore(BaseStore):
         field_name = self._embedding_field
         modern = dict(payload)
         num_candidates = modern.pop("num_candidates", None)
-        if num_candidates is not None:
-            method_params = modern.setdefault("method_parameters", {})
-            if "ef_search" not in method_params:
-                ef_search = self._calculate_ef_search(modern, num_candidates)
-                if ef_search is not None:
-                    method_params["ef_search"] = ef_search
+        method_params = modern.setdefault("method_parameters", {})
+        if "ef_search" not in method_params:
+            method_params["ef_search"] = self._calculate_ef_search(modern, num_candidates)
         return {field_name: modern}
 
-    def _calculate_ef_search(self, payload: dict[str, Any], num_candidates: Any) -> int | None:
-        try:
-            ef_search = int(num_candidates)
-            if ef_search <= 0:
-                return None
-            k_value = payload.get("k")
-            if k_value is not None:
-                k_int = max(int(k_value), 1)
-                ef_search = max(ef_search, k_int)
-            return ef_search
-        except Exception:
-            return None
+    def _calculate_ef_search(self, payload: dict[str, Any], num_candidates: Any) -> int:
+        # `hnsw_ef_search` is the recall floor; a larger candidate pool or `k` widens it.
+        ef_search = self.settings.hnsw_ef_search
+        for value in (num_candidates, payload.get("k")):
+            try:
+                ef_search = max(ef_search, int(value))
+            except (TypeError, ValueError):
+                continue
+        return ef_search
 
     def _merge_knn_filters(self, clause: dict[str, Any], filters: list[dict[str, Any]]) -> None:
         existing = clause.get("filter")
@@ -583,37 +2124,92 @@ class OpenSearchStore(BaseStore):
     def _handle_list_namespaces(self, op: ListNamespacesOp) -> list[tuple[str, ...]]:
         prefix_path = _extract_condition(op.match_conditions, "prefix")
         suffix_path = _extract_condition(op.match_conditions, "suffix")
-        size = min(max(op.limit + op.offset, 50), 1000)
-        filters: list[dict[str, Any]] = []
-        if prefix_path:
-            filters.append({"prefix": {"namespace_key": _namespace_key(prefix_path)}})
-        query: dict[str, Any]
-        if filters:
-            query = {"bool": {"filter": filters}}
-        else:
-            query = {"match_all": {}}
-        body = {
-            "size": size,
-            "query": query,
-            "sort": [{"namespace_key": "asc"}],
-        }
-        resp = self.client.search(index=self.settings.namespace_index_name, body=body)
-        hits = resp.get("hits", {}).get("hits", [])
-        namespaces: list[tuple[str, ...]] = []
-        for hit in hits:
-            raw_ns = hit.get("_source", {}).get("namespace", [])
-            if not isinstance(raw_ns, list):
-                continue
-            ns_tuple: tuple[str, ...] = tuple(raw_ns)
-            if suffix_path and not _suffix_matches(ns_tuple, suffix_path):
-                continue
-            if op.max_depth is not None and len(ns_tuple) > op.max_depth:
-                ns_tuple = ns_tuple[: op.max_depth]
-            namespaces.append(ns_tuple)
-        namespaces = sorted(dict.fromkeys(namespaces))
-        start = min(op.offset, len(namespaces))
-        end = min(start + op.limit, len(namespaces))
-        return namespaces[start:end]
+        listing = (prefix_path, suffix_path, op.max_depth)
+        # A page that starts where an earlier one ended resumes from its `after_key`;
+        # anything else re-aggregates from the first bucket.
+        cursor = self._take_namespace_cursor((*listing, op.offset)) if op.offset else None
+        skip = 0 if cursor is not None else op.offset
+        namespaces, next_cursor = self._scan_namespaces(
+            prefix_path, suffix_path, op.max_depth, skip + op.limit, cursor
+        )
+        if next_cursor is not None:
+            self._remember_namespace_cursor((*listing, op.offset + op.limit), next_cursor)
+        return namespaces[skip:]
+
+    def _scan_namespaces(
+        self,
+        prefix_path: NamespacePath | None,
+        suffix_path: NamespacePath | None,
+        max_depth: int | None,
+        wanted: int,
+        cursor: _NamespaceCursor | None = None,
+    ) -> tuple[list[NamespacePath], _NamespaceCursor | None]:
+        """Collect up to `wanted` distinct listed namespaces in `namespace_key` order.
+
+        A `composite` aggregation returns one bucket per namespace doc and is paged with
+        `after_key`, stopping as soon as enough namespaces are collected. Returns the
+        cursor to resume from, or `None` once the buckets are exhausted.
+        """
+
+        after, listed = cursor or (None, frozenset())
+        namespaces: list[NamespacePath] = []
+        seen = set(listed)
+        size = min(wanted, NAMESPACE_PAGE_SIZE)
+        while len(namespaces) < wanted:
+            body = _namespace_buckets_body(prefix_path, size, after)
+            resp = self.client.search(index=self.settings.namespace_index_name, body=body)
+            buckets = resp.get("aggregations", {}).get("namespaces", {}).get("buckets", [])
+            for bucket in buckets:
+                after = bucket["key"]
+                ns_tuple = self._listed_namespace(_bucket_namespace(bucket), suffix_path, max_depth)
+                # Truncated prefixes recur further down the key order, so de-duplicate
+                # across pages rather than within one.
+                if ns_tuple is None or ns_tuple in seen:
+                    continue
+                seen.add(ns_tuple)
+                namespaces.append(ns_tuple)
+                if len(namespaces) == wanted:
+                    break
+            if len(namespaces) < wanted and len(buckets) < size:
+                return namespaces, None
+        return namespaces, (after, frozenset(seen) if max_depth is not None else frozenset())
+
+    def _listed_namespace(
+        self,
+        raw_namespace: Any,
+        suffix_path: NamespacePath | None,
+        max_depth: int | None,
+    ) -> tuple[str, ...] | None:
+        if not isinstance(raw_namespace, list):
+            return None
+        ns_tuple: tuple[str, ...] = tuple(raw_namespace)
+        if suffix_path and not _suffix_matches(ns_tuple, suffix_path):
+            return None
+        if max_depth is not None and len(ns_tuple) > max_depth:
+            ns_tuple = ns_tuple[:max_depth]
+        return ns_tuple
+
+    def _take_namespace_cursor(self, key: tuple[Any, ...]) -> _NamespaceCursor | None:
+        # Popped, so each cursor continues exactly one pagination session.
+        with self._namespace_cursors_lock:
+            entry = self._namespace_cursors.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def _remember_namespace_cursor(self, key: tuple[Any, ...], cursor: _NamespaceCursor) -> None:
+        with self._namespace_cursors_lock:
+            cursors = self._namespace_cursors
+            cursors[key] = (time.monotonic() + NAMESPACE_CURSOR_TTL, cursor)
+            cursors.move_to_end(key)
+            while len(cursors) > NAMESPACE_CURSOR_LIMIT:
+                cursors.popitem(last=False)
+
+    def _invalidate_namespace_cursors(self) -> None:
+        # Namespace docs were upserted or their counts changed; a resumed page could
+        # skip or repeat entries relative to a fresh aggregation.
+        with self._namespace_cursors_lock:
+            self._namespace_cursors.clear()
 
     def get_stats(self) -> dict[str, Any]:
         total = self.client.count(index=self.settings.data_index_alias).get("count", 0)
@@ -652,6 +2248,7 @@ class OpenSearchStore(BaseStore):
         body = {
             "size": 1,
             "sort": [{"created_at": {"order": order}}],
+            "_source": ["namespace", "key", "created_at"],
         }
         resp = self.client.search(index=self.settings.data_index_alias, body=body)
         hits = resp.get("hits", {}).get("hits", [])
@@ -664,15 +2261,127 @@ class OpenSearchStore(BaseStore):
             "created_at": source.get("created_at"),
         }
 
-    def _doc_exists(self, doc_id: str) -> bool:
+    def _update_namespace_stats(self, namespace: NamespacePath, *, delta: int) -> None:
+        # Every write path ends here (or in the bulk variant), so it doubles as the
+        # invalidation point for the local vector cache and namespace cursors.
+        self._invalidate_namespace_vectors([namespace])
+        self._invalidate_namespace_cursors()
         try:
-            return bool(
-                self.client.exists(index=self.settings.data_index_alias, id=doc_id)
-            )
-        except Exception:
+            self._send_namespace_stats(namespace, delta)
+        except NotFoundError as exc:
+            if not self._fall_back_to_inline_script(exc.error):
+                raise
+            self._send_namespace_stats(namespace, delta)
+
+    def _send_namespace_stats(self, namespace: NamespacePath, delta: int) -> None:
+        self.client.update(
+            index=self.settings.namespace_index_name,
+            id=_namespace_key(namespace),
+            body=self._namespace_stats_body(namespace, delta),
+        )
+
+    async def _a_update_namespace_stats(self, namespace: NamespacePath, *, delta: int) -> None:
+        self._invalidate_namespace_vectors([namespace])
+        self._invalidate_namespace_cursors()
+        try:
+            await self._a_send_namespace_stats(namespace, delta)
+        except NotFoundError as exc:
+            if not self._fall_back_to_inline_script(exc.error):
+                raise
+            await self._a_send_namespace_stats(namespace, delta)
+
+    async def _a_send_namespace_stats(self, namespace: NamespacePath, delta: int) -> None:
+        await self.async_client.update(
+            index=self.settings.namespace_index_name,
+            id=_namespace_key(namespace),
+            body=self._namespace_stats_body(namespace, delta),
+        )
+
+    def _apply_namespace_deltas(self, deltas: Mapping[NamespacePath, int]) -> None:
+        """Send one scripted upsert, or a single `_bulk` of them, for a batch's deltas."""
+
+        if len(deltas) == 1:
+            ((namespace, delta),) = deltas.items()
+            self._update_namespace_stats(namespace, delta=delta)
+        elif deltas:
+            self._invalidate_namespace_vectors(deltas)
+            self._invalidate_namespace_cursors()
+            try:
+                helpers.bulk(self.client, self._namespace_stats_actions(deltas))
+            except helpers.BulkIndexError as exc:
+                retry = self._missing_script_retries(deltas, exc.errors)
+                if retry is None:
+                    raise
+                helpers.bulk(self.client, self._namespace_stats_actions(retry))
+
+    async def _a_apply_namespace_deltas(self, deltas: Mapping[NamespacePath, int]) -> None:
+        if len(deltas) == 1:
+            ((namespace, delta),) = deltas.items()
+            await self._a_update_namespace_stats(namespace, delta=delta)
+        elif deltas:
+            self._invalidate_namespace_vectors(deltas)
+            self._invalidate_namespace_cursors()
+            try:
+                await helpers.async_bulk(self.async_client, self._namespace_stats_actions(deltas))
+            except helpers.BulkIndexError as exc:
+                retry = self._missing_script_retries(deltas, exc.errors)
+                if retry is None:
+                    raise
+                await helpers.async_bulk(self.async_client, self._namespace_stats_actions(retry))
+
+    def _missing_script_retries(
+        self, deltas: Mapping[NamespacePath, int], errors: list[dict[str, Any]]
+    ) -> dict[NamespacePath, int] | None:
+        """Deltas to resend inline when every failed item only lacked the stored script."""
+
+        failed: set[str] = set()
+        for item in errors:
+            result = next(iter(item.values()), {})
+            error = result.get("error")
+            if not isinstance(error, Mapping) or error.get("type") != MISSING_SCRIPT_ERROR:
+                return None
+            failed.add(result.get("_id"))
+        if not self._fall_back_to_inline_script(MISSING_SCRIPT_ERROR):
+            return None
+        return {ns: delta for ns, delta in deltas.items() if _namespace_key(ns) in failed}
+
+    def _fall_back_to_inline_script(self, error_type: Any) -> bool:
+        """Switch namespace-stats updates to the inline script once the stored one is missing.
+
+        Indices deployed before `setup()` registered the script (or under another
+        `index_prefix`) answer with `resource_not_found_exception`; returns whether the
+        caller should resend its update.
+        """
+
+        if error_type != MISSING_SCRIPT_ERROR or not self._uses_stored_stats_script:
             return False
+        self._stored_stats_script_missing = True
+        logger.warning(
+            "stored script %s not found; sending namespace-stats updates inline. "
+            "Re-run setup() to register it.",
+            namespace_stats_script_id(self.settings),
+        )
+        return True
 
-    def _update_namespace_stats(self, namespace: NamespacePath, *, delta: int) -> None:
+    @property
+    def _uses_stored_stats_script(self) -> bool:
+        return self.settings.uses_stored_scripts and not self._stored_stats_script_missing
+
+    def _namespace_stats_actions(
+        self, deltas: Mapping[NamespacePath, int]
+    ) -> list[dict[str, Any]]:
+        index = self.settings.namespace_index_name
+        return [
+            {
+                "_op_type": "update",
+                "_index": index,
+                "_id": _namespace_key(namespace),
+                "_source": self._namespace_stats_body(namespace, delta),
+            }
+            for namespace, delta in deltas.items()
+        ]
+
+    def _namespace_stats_body(self, namespace: NamespacePath, delta: int) -> dict[str, Any]:
         namespace_key = _namespace_key(namespace)
         params = {
             "delta": delta,
@@ -681,14 +2390,12 @@ class OpenSearchStore(BaseStore):
             "depth": len(namespace),
             "updated_at": _serialize_ts(_now()),
         }
-        script = (
-            "if (ctx._source.doc_count == null) { ctx._source.doc_count = 0; } "
-            "ctx._source.doc_count = Math.max(0, ctx._source.doc_count + params.delta); "
-            "ctx._source.updated_at = params.updated_at; "
-            "ctx._source.namespace = params.namespace; "
-            "ctx._source.namespace_key = params.namespace_key; "
-            "ctx._source.depth = params.depth;"
-        )
+        # Stored scripts are registered by `setup()`; serverless collections lack them.
+        if self._uses_stored_stats_script:
+            script_id = namespace_stats_script_id(self.settings)
+            script: dict[str, Any] = {"id": script_id, "params": params}
+        else:
+            script = {"source": NAMESPACE_STATS_SCRIPT, "lang": "painless", "params": params}
         upsert_doc = {
             "namespace": params["namespace"],
             "namespace_key": namespace_key,
@@ -696,16 +2403,11 @@ class OpenSearchStore(BaseStore):
             "doc_count": max(delta, 0),
             "updated_at": params["updated_at"],
         }
-        body = {
+        return {
             "scripted_upsert": True,
-            "script": {"source": script, "lang": "painless", "params": params},
+            "script": script,
             "upsert": upsert_doc,
         }
-        self.client.update(
-            index=self.settings.namespace_index_name,
-            id=namespace_key,
-            body=body,
-        )
 
     def _top_namespaces(self, limit: int = 5) -> list[dict[str, Any]]:
         body = {
@@ -737,11 +2439,15 @@ class OpenSearchStore(BaseStore):
             fields,
         )
 
-    def _is_expired(self, source: dict[str, Any]) -> bool:
+    def _is_expired(self, source: dict[str, Any], now_iso: str | None = None) -> bool:
         expires = source.get("ttl_expires_at")
         if not expires:
             return False
-        return _parse_ts(expires) <= _now()
+        now_iso = now_iso or _serialize_ts(_now())
+        if _is_canonical_ts(expires):
+            # Same fixed-width UTC layout as `now_iso`, so string order is time order.
+            return expires <= now_iso
+        return _parse_ts(expires) <= _parse_ts(now_iso)
 
     def _should_refresh_ttl(self, refresh_flag: bool | None, source: dict[str, Any]) -> bool:
         if not source.get("ttl_expires_at"):
@@ -749,27 +2455,46 @@ class OpenSearchStore(BaseStore):
         return bool(refresh_flag or self.settings.ttl_refresh_on_read)
 
     def _refresh_ttl(self, doc_id: str, source: dict[str, Any]) -> None:
-        ttl_minutes = source.get("ttl_minutes") or self.settings.ttl_minutes_default
-        if ttl_minutes is None:
-            return
-        expires_at = _compute_ttl_expires(ttl_minutes)
-        if expires_at is None:
+        body = self._ttl_refresh_body(source)
+        if body is None:
             return
-        body = {
-            "doc": {
-                "ttl_expires_at": expires_at,
-                "updated_at": _serialize_ts(_now()),
-            }
-        }
         try:
             self.client.update(
                 index=self.settings.data_index_alias,
                 id=doc_id,
                 body=body,
             )
-        except Exception:
+        except TransportError:
             return
 
+    async def _a_refresh_ttl(self, doc_id: str, source: dict[str, Any]) -> None:
+        body = self._ttl_refresh_body(source)
+        if body is None:
+            return
+        try:
+            await self.async_client.update(
+                index=self.settings.data_index_alias,
+                id=doc_id,
+                body=body,
+            )
+        except TransportError:
+            return
+
+    def _ttl_refresh_body(self, source: dict[str, Any]) -> dict[str, Any] | None:
+        ttl_minutes = source.get("ttl_minutes") or self.settings.ttl_minutes_default
+        if ttl_minutes is None:
+            return None
+        now = _now()
+        expires_at = _compute_ttl_expires(ttl_minutes, now=now)
+        if expires_at is None:
+            return None
+        return {
+            "doc": {
+                "ttl_expires_at": expires_at,
+                "updated_at": _serialize_ts(now),
+            }
+        }
+
     def _resolve_ttl_minutes(self, ttl_value: Any) -> float | None:
         if ttl_value is NOT_PROVIDED:
             ttl_value = None
@@ -812,9 +2537,25 @@ class MetricsEmitter:
     def __init__(self, *, enabled: bool) -> None:
         self.enabled = enabled
         self._logger = logging.getLogger("langgraph.opensearch.store.metrics")
+        if not enabled:
+            # Shadow `record` so disabled emitters skip the payload and the check per call.
+            self.record = _discard_metric  # type: ignore[method-assign]
 
     def record(self, event: str, value: float, attributes: dict[str, Any] | None = None) -> None:
-        if not self.enabled:
-            return
         payload = {"event": event, "value": value, "attributes": attributes or {}}
         self._logger.info(payload)
+
+
+# Stores with `buffered_writes=True`, flushed at interpreter exit; weak references so the
+# hook never keeps a store (or its client) alive.
+_BUFFERED_STORES: weakref.WeakSet[OpenSearchStore] = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_buffered_stores() -> None:
+    for store in list(_BUFFERED_STORES):
+        store.flush()
+
+
+def _discard_metric(event: str, value: float, attributes: dict[str, Any] | None = None) -> None:
+    """Stand-in for `MetricsEmitter.record` when metrics are disabled."""
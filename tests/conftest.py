@@ -0,0 +1,9 @@
+import pytest
+
+from langgraph_opensearch_store.config import Settings
+
+
+@pytest.fixture(scope="session")
+def default_settings() -> Settings:
+    """Local-cluster settings built once; `model_copy` them before changing fields."""
+    return Settings(hosts="http://localhost:9200")
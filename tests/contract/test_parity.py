@@ -1,11 +1,15 @@
 import importlib
+import importlib.util
 import os
 from collections.abc import Iterator
-from typing import Any, Iterable, Protocol, cast
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterable, NamedTuple, Protocol, cast
 
 import pytest
 
 from langgraph_opensearch_store.store import OpenSearchStore
+from langgraph.store.base import PutOp
 from langgraph.store.memory import InMemoryStore
 
 
@@ -66,6 +70,7 @@ class _MemoryReferenceStore(_PostgresStoreProto):
         return {"total_items": total}
 
 
+@lru_cache(maxsize=1)
 def _load_postgres_store() -> tuple[type[_PostgresStoreProto], str]:
     try:
         module = importlib.import_module("langgraph.store.postgres")
@@ -77,86 +82,121 @@ def _load_postgres_store() -> tuple[type[_PostgresStoreProto], str]:
     return pg_cls, "postgres"
 
 
-ReferenceStore, REFERENCE_IMPL = _load_postgres_store()
+# Only locate the adapter here; importing it is deferred to the `reference_store` fixture,
+# so collection and non-contract runs never pay for `langgraph.store.postgres`.
+REFERENCE_IMPL = (
+    "postgres" if importlib.util.find_spec("langgraph.store.postgres") is not None else "memory"
+)
 
+# Each xdist worker writes under its own namespace so concurrent runs against shared
+# backends never see each other's documents.
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+PREFIX = ("prefs", WORKER_ID)
+
+
+class Row(NamedTuple):
+    namespace: tuple[str, ...]
+    key: str
+    doc: dict[str, Any]
+
+
+# Rows are still plain tuples, so they can be handed to `put_many` as-is.
 DATASET = [
-    (("prefs", "user_a"), "color", {"text": "I like blue"}),
-    (("prefs", "user_a"), "food", {"text": "I like pizza"}),
-    (("prefs", "user_b"), "color", {"text": "I like red"}),
+    Row((*PREFIX, "user_a"), "color", {"text": "I like blue"}),
+    Row((*PREFIX, "user_a"), "food", {"text": "I like pizza"}),
+    Row((*PREFIX, "user_b"), "color", {"text": "I like red"}),
 ]
 
-pytestmark = pytest.mark.contract
-
 
-def _require_env() -> tuple[str, str]:
-    os_conn = os.getenv("OPENSEARCH_CONN")
+def _missing_env() -> list[str]:
     missing: list[str] = []
-    pg_dsn: str | None
-    if REFERENCE_IMPL == "postgres":
-        pg_dsn = os.getenv("POSTGRES_DSN")
-        if not pg_dsn:
-            missing.append("POSTGRES_DSN")
-    else:
-        pg_dsn = "memory://local"
-    if not os_conn:
+    if REFERENCE_IMPL == "postgres" and not os.getenv("POSTGRES_DSN"):
+        missing.append("POSTGRES_DSN")
+    if not os.getenv("OPENSEARCH_CONN"):
         missing.append("OPENSEARCH_CONN")
-    if missing:
-        pytest.skip("Set " + " and ".join(missing) + " to run contract tests")
-    assert pg_dsn is not None
-    assert os_conn is not None
-    return pg_dsn, os_conn
+    return missing
+
 
+_MISSING_ENV = _missing_env()
 
-@pytest.fixture()
+# The environment is checked once at import, so unconfigured runs skip before any
+# fixture executes. `get_stats` counts whole indices, so the parity tests stay on one
+# worker together (`-n auto --dist loadgroup`) and share its session fixtures.
+pytestmark = [
+    pytest.mark.contract,
+    pytest.mark.skipif(
+        bool(_MISSING_ENV),
+        reason="Set " + " and ".join(_MISSING_ENV) + " to run contract tests",
+    ),
+    pytest.mark.xdist_group("parity"),
+]
+
+
+# The parity tests only read, so one setup and dataset load is shared by the session.
+@pytest.fixture(scope="session")
 def reference_store() -> Iterator[_PostgresStoreProto]:
-    pg_dsn, _ = _require_env()
-    store: _PostgresStoreProto = ReferenceStore.from_conn_string(pg_dsn)
+    reference_cls, impl = _load_postgres_store()
+    pg_dsn = os.environ["POSTGRES_DSN"] if impl == "postgres" else "memory://local"
+    store: _PostgresStoreProto = reference_cls.from_conn_string(pg_dsn)
     store.setup()
-    _load_dataset(store)
+    _bulk_load(store, DATASET)
     yield store
-    if REFERENCE_IMPL == "postgres":
+    if impl == "postgres":
         _truncate_store(store)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def opensearch_store():
-    _, os_conn = _require_env()
-    store = OpenSearchStore.from_conn_string(os_conn)
+    store = OpenSearchStore.from_conn_string(os.environ["OPENSEARCH_CONN"])
     store.setup()
-    _load_dataset(store)
+    _bulk_load(store, DATASET)
     yield store
+    # Leftover worker namespaces would skew `get_stats` parity on the next run.
+    _truncate_store(store)
+
+
+def _bulk_load(store: _PostgresStoreProto | OpenSearchStore, dataset: Iterable[Row]) -> None:
+    if isinstance(store, OpenSearchStore):
+        # One `_bulk` request instead of a round-trip per document.
+        store.put_many(dataset)
+        return
+    for row in dataset:
+        store.put(row.namespace, row.key, row.doc)
 
 
-def _load_dataset(store: _PostgresStoreProto | OpenSearchStore) -> None:
-    for namespace, key, doc in DATASET:
-        store.put(namespace, key, doc)
+def _truncate_store(store: _PostgresStoreProto | OpenSearchStore) -> None:
+    if isinstance(store, OpenSearchStore):
+        store.batch([PutOp(row.namespace, row.key, None) for row in DATASET])
+        store.flush()
+        return
+    for row in DATASET:
+        store.delete(row.namespace, row.key)
 
 
-def _truncate_store(store: _PostgresStoreProto) -> None:
-    for namespace, key, _ in DATASET:
-        store.delete(namespace, key)
+# Items expose `namespace` as a tuple already, so no per-item conversion is needed.
+_item_order = attrgetter("namespace", "key")
 
 
 def _sorted(items: Iterable):
-    return sorted(items, key=lambda item: (tuple(item.namespace), item.key))
+    return sorted(items, key=_item_order)
 
 
 def test_parity_get(reference_store, opensearch_store):
-    for namespace, key, _ in DATASET:
-        ref = reference_store.get(namespace, key)
-        ours = opensearch_store.get(namespace, key)
+    for row in DATASET:
+        ref = reference_store.get(row.namespace, row.key)
+        ours = opensearch_store.get(row.namespace, row.key)
         assert ref.value == ours.value
 
 
 def test_parity_search(reference_store, opensearch_store):
-    ref_results = reference_store.search(("prefs",), query="like", limit=10)
-    os_results = opensearch_store.search(("prefs",), query="like", limit=10)
+    ref_results = reference_store.search(PREFIX, query="like", limit=10)
+    os_results = opensearch_store.search(PREFIX, query="like", limit=10)
     assert len(ref_results) == len(os_results)
 
 
 def test_parity_list_namespaces(reference_store, opensearch_store):
-    ref_list = reference_store.list_namespaces(prefix=("prefs",))
-    os_list = opensearch_store.list_namespaces(prefix=("prefs",))
+    ref_list = reference_store.list_namespaces(prefix=PREFIX)
+    os_list = opensearch_store.list_namespaces(prefix=PREFIX)
     assert set(ref_list) == set(os_list)
 
 
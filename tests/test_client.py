@@ -0,0 +1,65 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from langgraph_opensearch_store import client as client_module
+from langgraph_opensearch_store.config import Settings
+
+
+def test_sigv4_credentials_are_cached_per_role(monkeypatch):
+    pytest.importorskip("boto3")
+    sts = MagicMock()
+    sts.assume_role.return_value = {
+        "Credentials": {
+            "AccessKeyId": "AK",
+            "SecretAccessKey": "SK",
+            "SessionToken": "TOKEN",
+            "Expiration": datetime.now(UTC) + timedelta(hours=1),
+        }
+    }
+    monkeypatch.setattr("boto3.client", lambda *args, **kwargs: sts)
+    monkeypatch.setattr(client_module, "_CRED_CACHE", {})
+    monkeypatch.setattr(client_module, "_SIGNER_CACHE", {})
+    settings = Settings(
+        hosts="https://search-mem.us-east-1.es.amazonaws.com",
+        auth_mode="sigv4",
+        aws_region="us-east-1",
+        aws_role_arn="arn:aws:iam::123456789012:role/LangGraphMemoryRole",
+    )
+
+    first = client_module._sigv4_auth(settings)
+    second = client_module._sigv4_auth(settings)
+
+    assert sts.assume_role.call_count == 1
+    assert first is second
+    assert first.signer.credentials is second.signer.credentials
+    assert first.signer.credentials.get_frozen_credentials().access_key == "AK"
+
+
+def test_create_client_uses_pooled_urllib3_connections(default_settings: Settings):
+    settings = default_settings.model_copy(update={"pool_maxsize": 8})
+    client = client_module.create_client(settings)
+    connection = client.transport.connection_pool.connections[0]
+    assert isinstance(connection, client_module.Urllib3HttpConnection)
+    assert connection.pool.pool.maxsize == 8
+    assert connection.http_compress is True
+
+
+def test_create_client_kwargs_override_defaults(default_settings: Settings):
+    settings = default_settings.model_copy(update={"pool_maxsize": 8})
+    client = client_module.create_client(settings, pool_maxsize=2, max_retries=0)
+    connection = client.transport.connection_pool.connections[0]
+    assert connection.pool.pool.maxsize == 2
+    assert client.transport.max_retries == 0
+
+
+def test_create_client_serializes_with_orjson(default_settings: Settings):
+    pytest.importorskip("orjson")
+    np = pytest.importorskip("numpy")
+    client = client_module.create_client(default_settings)
+    serializer = client.transport.serializer
+    assert isinstance(serializer, client_module._OrjsonSerializer)
+    payload = serializer.dumps({"embedding": np.asarray([0.5, 1.0], dtype=np.float32)})
+    assert payload == '{"embedding":[0.5,1.0]}'
+    assert serializer.loads(payload) == {"embedding": [0.5, 1.0]}
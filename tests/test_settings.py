@@ -4,15 +4,49 @@ from langgraph_opensearch_store.config import Settings
 def test_hosts_are_normalized():
     settings = Settings(hosts="localhost:9200, https://remote:443")  # type: ignore[arg-type]
     assert settings.hosts == ["https://localhost:9200", "https://remote:443"]
+    settings = Settings(hosts=" httpbin.local:9200 ,, http://a:9200 ")  # type: ignore[arg-type]
+    assert settings.hosts == ["https://httpbin.local:9200", "http://a:9200"]
+    settings = Settings(hosts="HTTP://a:9200,Https://b:443")  # type: ignore[arg-type]
+    assert settings.hosts == ["HTTP://a:9200", "Https://b:443"]
 
 
-def test_namespace_hash_is_stable():
-    settings = Settings(hosts="http://localhost:9200")
+def test_namespace_hash_is_stable(default_settings: Settings):
+    settings = default_settings
     idx1 = settings.namespace_to_index(("prefs", "u1"))
     idx2 = settings.namespace_to_index(("prefs", "u1"))
     assert idx1 == idx2
+    assert settings.namespace_to_index(("other",)) is settings.data_index_alias
 
 
 def test_ignore_ssl_flag_turns_off_verification():
     settings = Settings(hosts="http://localhost:9200", ignore_ssl_certs=True)
     assert settings.verify_certs is False
+
+
+def test_derived_index_names_track_prefix():
+    settings = Settings(hosts="http://localhost:9200", index_prefix="mem")
+    assert settings.data_index_alias == "mem-data"
+    assert settings.host_urls() == ["http://localhost:9200"]
+    settings.index_prefix = "other"
+    assert settings.data_index_alias == "other-data"
+    assert settings.namespace_index_name == "other-namespace"
+
+
+def test_model_copy_rebuilds_derived_names(default_settings: Settings):
+    copy = default_settings.model_copy(
+        update={"index_prefix": "other", "hosts": ["http://a:9200", "http://b:9200"]}
+    )
+    assert copy.data_index_alias == "other-data"
+    assert copy.namespace_index_name == "other-namespace"
+    assert copy.host_urls() == ["http://a:9200", "http://b:9200"]
+    assert default_settings.data_index_alias == "langgraph-data"
+
+
+def test_from_env_file_skips_comments_and_blank_lines(tmp_path):
+    env_file = tmp_path / "test.env"
+    env_file.write_text(
+        "# local cluster\n\nhosts = http://localhost:9200\n  index_prefix=mem  \nnot a pair\n"
+    )
+    settings = Settings.from_env_file(str(env_file))
+    assert settings.hosts == ["http://localhost:9200"]
+    assert settings.index_prefix == "mem"
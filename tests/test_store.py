@@ -1,12 +1,52 @@
-from unittest.mock import MagicMock
+import asyncio
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock
 
+import numpy as np
 import pytest
 
 from langchain_core.embeddings import Embeddings
+from langgraph.store.base import GetOp, PutOp, SearchOp
+from opensearchpy import JSONSerializer, NotFoundError, helpers
+from opensearchpy import ConnectionError as ClusterUnavailable
 
 from langgraph_opensearch_store.config import Settings
 from langgraph_opensearch_store.schema import TemplateManager
-from langgraph_opensearch_store.store import OpenSearchStore
+from langgraph_opensearch_store import store as store_module
+from langgraph_opensearch_store.store import OpenSearchStore, _parse_ts
+
+_DIM = Settings.model_fields["embedding_dim"].default
+# Query vector shared by the kNN body tests. `_apply_knn_query` only reads it, and the
+# tuple keeps one test from mutating what the next one sees.
+VECTOR = (0.0,) * _DIM
+
+
+# Client methods the store (and the opensearch-py helpers it calls) may touch; anything
+# else raises instead of quietly returning a child mock.
+_CLIENT_API = [
+    "bulk",
+    "clear_scroll",
+    "close",
+    "cluster",
+    "count",
+    "delete",
+    "delete_by_query",
+    "exists",
+    "get",
+    "index",
+    "indices",
+    "info",
+    "mget",
+    "msearch",
+    "put_script",
+    "scroll",
+    "search",
+    "snapshot",
+    "transport",
+    "update",
+]
 
 
 class DummyEmbeddings(Embeddings):
@@ -14,20 +54,37 @@ class DummyEmbeddings(Embeddings):
         self.dim = dim
 
     def embed_documents(self, texts):  # pragma: no cover - tests only
-        return [[float(len(text))] * self.dim for text in texts]
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.float32, count=len(texts))
+        return np.broadcast_to(lengths[:, None], (len(texts), self.dim)).tolist()
 
     def embed_query(self, text: str):  # pragma: no cover - trivial math
-        return [float(len(text))] * self.dim
+        return np.full(self.dim, len(text), dtype=np.float32).tolist()
+
+
+def _stats_delta(update: Mock) -> int:
+    return update.call_args.kwargs["body"]["script"]["params"]["delta"]
+
+
+@pytest.fixture(scope="module")
+def _store_template(default_settings: Settings) -> SimpleNamespace:
+    settings = default_settings
+    return SimpleNamespace(
+        settings=settings, embeddings=DummyEmbeddings(dim=settings.embedding_dim)
+    )
 
 
 @pytest.fixture()
-def store() -> OpenSearchStore:
-    client = MagicMock()
-    client.snapshot = MagicMock()
-    settings = Settings(hosts="http://localhost:9200")
-    embeddings = DummyEmbeddings(dim=settings.embedding_dim)
-    client.exists.return_value = False
-    return OpenSearchStore(settings=settings, client=client, embeddings=embeddings)
+def store(_store_template: SimpleNamespace) -> OpenSearchStore:
+    client = Mock(spec_set=_CLIENT_API)
+    client.snapshot = Mock(spec_set=["create", "restore", "delete"])
+    client.transport = SimpleNamespace(serializer=JSONSerializer())
+    client.index.return_value = {"result": "created"}
+    # Tests tweak settings freely, so each store gets its own copy of the shared template.
+    return OpenSearchStore(
+        settings=_store_template.settings.model_copy(),
+        client=client,
+        embeddings=_store_template.embeddings,
+    )
 
 
 def test_from_params_constructs_settings():
@@ -36,37 +93,785 @@ def test_from_params_constructs_settings():
     assert store.settings.hosts[0] == "http://localhost:9200"
 
 
+def test_from_settings_caches_embeddings():
+    settings = Settings(hosts="http://localhost:9200", embedding_dim=4)
+    base = DummyEmbeddings(dim=4)
+    base.embed_query = MagicMock(wraps=base.embed_query)  # type: ignore[method-assign]
+    base.embed_documents = MagicMock(wraps=base.embed_documents)  # type: ignore[method-assign]
+    store = OpenSearchStore.from_settings(settings=settings, embeddings=base)
+    assert store.embeddings is not None
+    store.embeddings.embed_query("pizza")
+    store.embeddings.embed_query("pizza")
+    assert base.embed_query.call_count == 1
+    vectors = store.embeddings.embed_documents(["a", "bb", "a"])
+    assert vectors == [[1.0] * 4, [2.0] * 4, [1.0] * 4]
+    base.embed_documents.assert_called_once_with(["a", "bb"])
+
+
+def test_embedding_cache_hands_out_copies():
+    from langgraph_opensearch_store._embed_cache import CachedEmbeddings
+
+    base = DummyEmbeddings(dim=4)
+    provided = [9.0] * 4
+    base.embed_query = MagicMock(return_value=provided)  # type: ignore[method-assign]
+    cache = CachedEmbeddings(base)
+    cache.embed_query("pizza")
+    provided[0] = 0.0
+    first = cache.embed_query("pizza")
+    first[1] = 0.0
+    assert cache.embed_query("pizza") == [9.0] * 4
+    docs = cache.embed_documents(["a", "a"])
+    docs[0][0] = 0.0
+    assert docs[1] == [1.0] * 4
+    assert cache.embed_documents(["a"]) == [[1.0] * 4]
+
+
+def test_embedding_cache_expires_after_ttl(monkeypatch):
+    from langgraph_opensearch_store import _embed_cache
+
+    clock = [100.0]
+    monkeypatch.setattr(_embed_cache, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    settings = Settings(
+        hosts="http://localhost:9200", embedding_dim=4, embedding_cache_ttl_seconds=60
+    )
+    base = DummyEmbeddings(dim=4)
+    base.embed_query = MagicMock(wraps=base.embed_query)  # type: ignore[method-assign]
+    store = OpenSearchStore(settings=settings, client=MagicMock(), embeddings=base)
+    store._embed_query("pizza")
+    clock[0] += 30
+    store._embed_query("pizza")
+    assert base.embed_query.call_count == 1
+    clock[0] += 31
+    store._embed_query("pizza")
+    assert base.embed_query.call_count == 2
+
+
 def test_put_index_called(store: OpenSearchStore):
     store.put(("prefs", "user"), "k1", {"text": "hello"})
     store.client.index.assert_called_once()
     kwargs = store.client.index.call_args.kwargs
     assert kwargs["index"] == store.settings.data_index_alias
     assert "::" in kwargs["id"]
+    store.client.exists.assert_not_called()
     store.client.update.assert_called_once()
+    assert _stats_delta(store.client.update) == 1
+
+
+def test_list_namespaces_are_accepted_like_tuples(store: OpenSearchStore):
+    store.put(["prefs", "user"], "k1", {"text": "hello"})
+    assert store.client.index.call_args.kwargs["id"] == "prefs::user::k1"
+    store.client.get.return_value = {"_source": {"namespace": ["prefs", "user"], "key": "k1"}}
+    assert store.get(["prefs", "user"], "k1").namespace == ("prefs", "user")
+    store.client.bulk.return_value = {
+        "errors": False,
+        "items": [{"index": {"_id": "prefs::k2", "status": 201, "result": "created"}}],
+    }
+    store.put_many([(["prefs"], "k2", {"text": "hi"})])
+    store.client.search.return_value = {"hits": {"hits": []}}
+    store.client.msearch.return_value = {"responses": [{"hits": {"hits": []}}]}
+    namespace_term = json.dumps({"term": {"namespace_key": "prefs"}})
+    store.search_batch(["prefs"], ["hello"])
+    assert namespace_term in json.dumps(store.client.msearch.call_args.kwargs["body"][1])
+    store.search(["prefs"], query="hello", mmr_lambda=0.5)
+    assert namespace_term in json.dumps(store.client.search.call_args.kwargs["body"])
+
+
+def test_put_delta_follows_write_result(store: OpenSearchStore):
+    store.client.index.return_value = {"result": "updated"}
+    store.put(("prefs",), "k1", {"text": "hello"})
+    assert _stats_delta(store.client.update) == 0
+
+    store.client.update.reset_mock()
+    store.client.delete.return_value = {"result": "not_found"}
+    store.delete(("prefs",), "missing")
+    store.client.delete.assert_called_once()
+    store.client.update.assert_not_called()
+
+    store.client.delete.return_value = {"result": "deleted"}
+    store.delete(("prefs",), "k1")
+    assert _stats_delta(store.client.update) == -1
+
+
+def test_put_many_streams_bulk_actions(store: OpenSearchStore):
+    store.client.bulk.return_value = {
+        "errors": False,
+        "items": [
+            {"index": {"_id": "prefs::user::k1", "status": 201, "result": "created"}},
+            {"index": {"_id": "prefs::user::k2", "status": 200, "result": "updated"}},
+        ],
+    }
+    store.put_many(
+        [
+            (("prefs", "user"), "k1", {"text": "hello"}),
+            (("prefs", "user"), "k2", {"text": "bye"}),
+        ]
+    )
+    store.client.bulk.assert_called_once()
+    store.client.index.assert_not_called()
+    lines = store.client.bulk.call_args.kwargs["body"].splitlines()
+    assert len(lines) == 4
+    assert '"embedding"' in lines[1]
+    store.client.update.assert_called_once()
+    params = store.client.update.call_args.kwargs["body"]["script"]["params"]
+    assert params["delta"] == 1
+
+
+def test_namespace_stats_reference_stored_script(store: OpenSearchStore):
+    script = store._namespace_stats_body(("prefs",), 1)["script"]
+    assert script["id"] == "langgraph-ns_stats_upsert"
+    assert "source" not in script
+    store.settings.aws_service = "aoss"
+    script = store._namespace_stats_body(("prefs",), 1)["script"]
+    assert "id" not in script
+    assert "doc_count" in script["source"]
+
+
+def test_namespace_stats_fall_back_inline_when_stored_script_missing(store: OpenSearchStore):
+    missing = NotFoundError(404, "resource_not_found_exception", {})
+    store.client.update.side_effect = [missing, {"result": "created"}, {"result": "updated"}]
+    store._update_namespace_stats(("prefs",), delta=1)
+    store._update_namespace_stats(("prefs",), delta=1)
+    scripts = [call.kwargs["body"]["script"] for call in store.client.update.call_args_list]
+    assert "id" in scripts[0]
+    assert all("source" in script for script in scripts[1:])
+
+
+def test_bulk_namespace_stats_resend_only_items_missing_the_script(store: OpenSearchStore):
+    missing = {"type": "resource_not_found_exception", "reason": "unable to find script"}
+    store.client.bulk.side_effect = [
+        {
+            "errors": True,
+            "items": [
+                {"update": {"_id": "a", "status": 200, "result": "updated"}},
+                {"update": {"_id": "b", "status": 404, "error": missing}},
+            ],
+        },
+        {"errors": False, "items": [{"update": {"_id": "b", "status": 201}}]},
+    ]
+    store._apply_namespace_deltas({("a",): 1, ("b",): 2})
+    resent = store.client.bulk.call_args_list[1].kwargs["body"].splitlines()
+    assert len(resent) == 2
+    assert '"b"' in resent[0]
+    assert '"source"' in resent[1]
+
+
+def test_batch_coalesces_puts_into_one_bulk(store: OpenSearchStore):
+    store.client.bulk.side_effect = [
+        {
+            "errors": False,
+            "items": [
+                {"index": {"_id": "a::k1", "status": 201, "result": "created"}},
+                {"delete": {"_id": "a::k2", "status": 200, "result": "deleted"}},
+                {"index": {"_id": "b::k3", "status": 201, "result": "created"}},
+            ],
+        },
+        {
+            "errors": False,
+            "items": [
+                {"update": {"_id": "a", "status": 200, "result": "updated"}},
+                {"update": {"_id": "b", "status": 201, "result": "created"}},
+            ],
+        },
+    ]
+    store.client.get.return_value = {"_source": {"namespace": ["a"], "key": "k0", "doc": {}}}
+    results = store.batch(
+        [
+            GetOp(("a",), "k0"),
+            PutOp(("a",), "k1", {"text": "stale"}),
+            PutOp(("a",), "k2", None),
+            PutOp(("b",), "k3", {"text": "three"}),
+            PutOp(("a",), "k1", {"text": "fresh"}),
+        ]
+    )
+    assert results[0].key == "k0"
+    assert results[1:] == [None, None, None, None]
+    assert store.client.bulk.call_count == 2
+    store.client.index.assert_not_called()
+    store.client.exists.assert_not_called()
+    store.client.update.assert_not_called()
+    data_call, stats_call = store.client.bulk.call_args_list
+    lines = data_call.kwargs["body"].splitlines()
+    assert len(lines) == 5
+    assert '"fresh"' in lines[1]
+    stats_lines = [json.loads(line) for line in stats_call.kwargs["body"].splitlines()]
+    deltas = {
+        header["update"]["_id"]: body["script"]["params"]["delta"]
+        for header, body in zip(stats_lines[::2], stats_lines[1::2])
+    }
+    assert deltas == {"a": 0, "b": 1}
+
+
+@pytest.mark.parametrize("puts", [1, 2], ids=["single-put", "coalesced-puts"])
+def test_batch_reads_see_earlier_puts(store: OpenSearchStore, puts: int):
+    store.client.bulk.return_value = {
+        "errors": False,
+        "items": [
+            {"index": {"_id": f"a::k{i}", "status": 201, "result": "created"}} for i in range(puts)
+        ],
+    }
+    store.client.get.return_value = {"_source": {"namespace": ["a"], "key": "k0", "doc": {}}}
+    ops = [PutOp(("a",), f"k{i}", {"text": "hi"}) for i in range(puts)]
+    results = store.batch([*ops, GetOp(("a",), "k0")])
+    assert results[-1].key == "k0"
+    calls = [name for name, *_ in store.client.method_calls]
+    write = "index" if puts == 1 else "bulk"
+    assert calls.index(write) < calls.index("get")
+
+
+def test_abatch_embeds_puts_with_one_async_call(store: OpenSearchStore):
+    store._embeddings.aembed_documents = AsyncMock(  # type: ignore[union-attr]
+        return_value=[[0.5] * store.settings.embedding_dim] * 2
+    )
+    async_client = AsyncMock()
+    async_client.transport = SimpleNamespace(serializer=JSONSerializer())
+    async_client.bulk.return_value = {
+        "errors": False,
+        "items": [
+            {"index": {"_id": "a::k1", "status": 201, "result": "created"}},
+            {"index": {"_id": "a::k2", "status": 200, "result": "updated"}},
+        ],
+    }
+    store._async_client = async_client
+    asyncio.run(
+        store.abatch(
+            [
+                PutOp(("a",), "k1", {"text": "one"}),
+                PutOp(("a",), "k2", {"text": "two"}),
+            ]
+        )
+    )
+    store._embeddings.aembed_documents.assert_awaited_once_with(["one", "two"])  # type: ignore[union-attr]
+    store.client.bulk.assert_not_called()
+    lines = async_client.bulk.call_args.kwargs["body"].splitlines()
+    assert all('"embedding"' in line for line in lines[1::2])
+    async_client.update.assert_awaited_once()
+    assert _stats_delta(async_client.update) == 1
+
+
+def test_build_filters_returns_fresh_namespace_terms(store: OpenSearchStore):
+    first = store._build_filters(("prefs", "user"), None)
+    second = store._build_filters(("prefs", "user"), {"lang": "en"})
+    assert first[0] == second[0] and first[0] is not second[0]
+    first[0]["term"]["namespace_key"] = "mutated"
+    assert store._build_filters(("prefs", "user"), None)[0] == {
+        "term": {"namespace_key": "prefs::user"}
+    }
+    assert second[-1] == {"term": {"doc.lang": "en"}}
+    now = "2030-01-01T00:00:00.000000Z"
+    ttl_clause = store._build_filters(("a",), None, now=now)[1]
+    other = store._build_filters(("b",), None, now=now)[1]
+    assert other == ttl_clause and other is not ttl_clause
+    assert other["bool"]["should"][0] is ttl_clause["bool"]["should"][0]
+    assert ttl_clause["bool"]["should"][1] == {"range": {"ttl_expires_at": {"gt": now}}}
+
+
+def test_namespace_hash_is_indexed_and_filterable(store: OpenSearchStore):
+    store.put(("prefs", "user"), "k1", {"text": "hello"})
+    namespace_hash = store.client.index.call_args.kwargs["document"]["namespace_hash"]
+    assert isinstance(namespace_hash, int)
+    assert -(2**63) <= namespace_hash < 2**63
+    store.settings.namespace_hash_filter = True
+    filters = store._build_filters(("prefs", "user"), None)
+    assert filters[0] == {"term": {"namespace_hash": namespace_hash}}
 
 
 def test_search_body_respects_namespace(store: OpenSearchStore):
     store.settings.search_mode = "text"
     store.client.search.return_value = {"hits": {"hits": []}}
     store.search(("prefs", "user"), query="hello", limit=2)
-    args, kwargs = store.client.search.call_args
+    kwargs = store.client.search.call_args.kwargs
     assert kwargs["index"] == store.settings.data_index_alias
     body = kwargs["body"]
     filters = body["query"]["bool"]["filter"]
     assert any(f.get("term", {}).get("namespace_key") == "prefs::user" for f in filters)
 
 
-def test_list_namespaces_filters_results(store: OpenSearchStore):
+def test_non_vector_reads_exclude_embeddings(store: OpenSearchStore):
+    store.client.search.return_value = {"hits": {"hits": []}}
+    store.client.get.return_value = {"_source": {"namespace": ["prefs"], "key": "k1"}}
+    for mode in ("text", "vector"):
+        store.settings.search_mode = mode
+        store.search(("prefs",), query="hello", limit=2)
+        body = store.client.search.call_args.kwargs["body"]
+        assert body["_source"] == {"excludes": ["embedding", "embedding_scale"]}
+    store.get(("prefs",), "k1")
+    excludes = store.client.get.call_args.kwargs["_source_excludes"]
+    assert excludes == ["embedding", "embedding_scale"]
+
+
+def test_put_many_pauses_refresh_for_large_batches(store: OpenSearchStore):
+    store.settings.bulk_pause_refresh_threshold = 1
+    store.client.bulk.return_value = {
+        "errors": False,
+        "items": [{"index": {"_id": "prefs::k1", "status": 201, "result": "created"}}],
+    }
+    store.client.indices.get_settings.return_value = {
+        "langgraph-data-000001": {"settings": {"index": {"refresh_interval": "30s"}}},
+        "langgraph-data-000002": {"settings": {}},
+    }
+    store.put_many([(("prefs",), "k1", {"text": "hello"})])
+    calls = [call.kwargs for call in store.client.indices.put_settings.call_args_list]
+    assert calls == [
+        {"index": store.settings.data_index_alias, "body": {"index": {"refresh_interval": "-1"}}},
+        {"index": "langgraph-data-000001", "body": {"index": {"refresh_interval": "30s"}}},
+        {"index": "langgraph-data-000002", "body": {"index": {"refresh_interval": None}}},
+    ]
+
+
+def test_overlapping_bulk_loads_share_one_refresh_pause(store: OpenSearchStore):
+    indices = store.client.indices
+    indices.get_settings.return_value = {"idx": {"settings": {"index": {"refresh_interval": "1s"}}}}
+    with store._refresh_paused(True):
+        with store._refresh_paused(True):
+            assert indices.put_settings.call_count == 1
+        assert indices.put_settings.call_count == 1
+    indices.get_settings.assert_called_once()
+    assert indices.put_settings.call_args.kwargs == {
+        "index": "idx",
+        "body": {"index": {"refresh_interval": "1s"}},
+    }
+
+    async_client = AsyncMock()
+    async_client.indices.get_settings.return_value = {"idx": {"settings": {}}}
+    store._async_client = async_client
+
+    async def overlap() -> None:
+        async with store._a_refresh_paused(True):
+            async with store._a_refresh_paused(True):
+                pass
+            async_client.indices.put_settings.assert_awaited_once()
+
+    asyncio.run(overlap())
+    assert async_client.indices.put_settings.await_count == 2
+    assert async_client.indices.put_settings.call_args.kwargs["body"] == {
+        "index": {"refresh_interval": None}
+    }
+
+
+def test_cancelled_async_refresh_pause_releases_its_slot(store: OpenSearchStore):
+    async_client = AsyncMock()
+    store._async_client = async_client
+    intervals = {"idx": {"settings": {"index": {"refresh_interval": "1s"}}}}
+
+    async def get_settings(**kwargs):
+        assert not store._refresh_pause_lock.locked()  # no request runs under the lock
+        await asyncio.sleep(1)
+
+    async_client.indices.get_settings.side_effect = get_settings
+
+    async def cancel_mid_pause() -> None:
+        async def load() -> None:
+            async with store._a_refresh_paused(True):
+                pass
+
+        task = asyncio.create_task(load())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_mid_pause())
+    async_client.indices.put_settings.assert_not_called()
+    assert store._refresh_pausers == 0
+
+    # A later sync load pauses and restores as usual instead of waiting on a held lock.
+    store.client.indices.get_settings.return_value = intervals
+    with store._refresh_paused(True):
+        pass
+    store.client.indices.get_settings.assert_called_once()
+    assert store.client.indices.put_settings.call_count == 2
+
+
+def test_buffered_writes_flush_on_batch_size_and_reads(store: OpenSearchStore):
+    store.settings.buffered_writes = True
+    store.settings.index_batch_size = 2
+    store.client.bulk.return_value = {"errors": False, "items": []}
+    store.put(("prefs",), "k1", {"text": "one"})
+    store.client.bulk.assert_not_called()
+    store.put(("prefs",), "k2", {"text": "two"})
+    assert store.client.bulk.call_count == 1
+    store.put(("prefs",), "k3", {"text": "three"})
+    store.client.get.return_value = {"_source": {"key": "k3", "doc": {"text": "three"}}}
+    assert store.get(("prefs",), "k3") is not None
+    assert store.client.bulk.call_count == 2
+    store.client.index.assert_not_called()
+
+
+def test_buffered_writes_keep_last_value_per_key(store: OpenSearchStore):
+    store.settings.buffered_writes = True
+    store.settings.index_batch_size = 10
+
+    def bulk(*args, **kwargs):
+        assert not store._flush_lock.locked()  # writers can still queue during the send
+        return {"errors": False, "items": []}
+
+    store.client.bulk.side_effect = bulk
+    store.put(("prefs",), "k1", {"text": "old"})
+    store.put(("prefs",), "k2", {"text": "other"})
+    store.put(("prefs",), "k1", {"text": "new"})
+    store.flush()
+    lines = [json.loads(line) for line in store.client.bulk.call_args.kwargs["body"].splitlines()]
+    assert [line["index"]["_id"] for line in lines[::2]] == ["prefs::k2", "prefs::k1"]
+    assert lines[3]["doc"] == {"text": "new"}
+
+
+def test_failed_timer_flush_requeues_writes_and_reports_on_next_put(store: OpenSearchStore):
+    store.settings.buffered_writes = True
+    store.settings.index_batch_size = 10
+    store.put(("prefs",), "k1", {"text": "one"})
+    timer = store._flush_timer
+    assert timer is not None
+    timer.cancel()
+    store.client.bulk.side_effect = ClusterUnavailable("N/A", "unreachable", OSError())
+    timer.function()  # what the timer thread would run
+
+    assert list(store._bulk_buffer) == [(("prefs",), "k1")]
+    with pytest.raises(helpers.BulkIndexError):
+        store.put(("prefs",), "k2", {"text": "two"})
+
+    store.client.bulk.side_effect = None
+    store.client.bulk.return_value = {"errors": False, "items": []}
+    store.put(("prefs",), "k2", {"text": "two"})
+    store.flush()
+    lines = [json.loads(line) for line in store.client.bulk.call_args.kwargs["body"].splitlines()]
+    assert [line["index"]["_id"] for line in lines[::2]] == ["prefs::k1", "prefs::k2"]
+    assert not store._bulk_buffer
+
+
+def test_search_batch_uses_single_msearch(store: OpenSearchStore):
+    store.settings.search_mode = "vector"
+    hit = {
+        "_id": "prefs::user::k1",
+        "_score": 1.0,
+        "_source": {"namespace": ["prefs", "user"], "key": "k1", "doc": {"text": "hi"}},
+    }
+    store.client.msearch.return_value = {
+        "responses": [{"hits": {"hits": [hit]}}, {"hits": {"hits": []}}]
+    }
+    results = store.search_batch(("prefs", "user"), ["hello", "bye"], limit=2)
+    store.client.msearch.assert_called_once()
+    store.client.search.assert_not_called()
+    lines = store.client.msearch.call_args.kwargs["body"]
+    assert len(lines) == 4
+    assert "knn" in lines[1]["query"]
+    assert [len(items) for items in results] == [1, 0]
+    assert results[0][0].key == "k1"
+
+
+def test_search_batch_embeds_queries_like_search(monkeypatch, store: OpenSearchStore):
+    store.settings.search_mode = "vector"
+    base = store.embeddings.base  # type: ignore[union-attr]
+    monkeypatch.setattr(base, "embed_query", MagicMock(wraps=base.embed_query))
+    monkeypatch.setattr(base, "embed_documents", MagicMock(wraps=base.embed_documents))
+    store.client.msearch.return_value = {"responses": [{"hits": {"hits": []}}] * 3}
+    store.search_batch(("prefs",), ["hello", "bye", "hello"])
+    assert [call.args[0] for call in base.embed_query.call_args_list] == ["hello", "bye"]
+    base.embed_documents.assert_not_called()
+
+    base.embed_query.side_effect = RuntimeError("provider down")
+    for run in (
+        lambda: store.search(("prefs",), query="down"),
+        lambda: store.search_batch(("prefs",), ["down", "again"]),
+    ):
+        with pytest.raises(RuntimeError, match="provider down"):
+            run()
+
+
+def test_batch_coalesces_search_ops_into_one_msearch(store: OpenSearchStore):
+    store.settings.search_mode = "text"
+    hit = {
+        "_id": "prefs::user::k1",
+        "_score": 1.0,
+        "_source": {"namespace": ["prefs", "user"], "key": "k1", "doc": {"text": "hi"}},
+    }
+    store.client.msearch.return_value = {
+        "responses": [{"hits": {"hits": [hit]}}, {"hits": {"hits": []}}]
+    }
+    results = store.batch(
+        [
+            SearchOp(("prefs", "user"), query="hello", limit=3),
+            SearchOp(("docs",), query="bye", filter={"lang": "en"}),
+        ]
+    )
+    store.client.msearch.assert_called_once()
+    store.client.search.assert_not_called()
+    lines = store.client.msearch.call_args.kwargs["body"]
+    assert len(lines) == 4
+    assert lines[1]["size"] == 3
+    assert {"term": {"doc.lang": "en"}} in lines[3]["query"]["bool"]["filter"]
+    assert [item.key for item in results[0]] == ["k1"] and results[1] == []
+
+
+def test_batch_search_ops_embed_texts_as_queries(monkeypatch, store: OpenSearchStore):
+    store.settings.search_mode = "vector"
+    base = store.embeddings.base  # type: ignore[union-attr]
+    monkeypatch.setattr(base, "embed_query", MagicMock(wraps=base.embed_query))
+    monkeypatch.setattr(base, "embed_documents", MagicMock(wraps=base.embed_documents))
+    store.client.msearch.return_value = {"responses": [{"hits": {"hits": []}}] * 2}
+    store.batch([SearchOp(("a",), query="one"), SearchOp(("b",), query="two")])
+    assert [call.args[0] for call in base.embed_query.call_args_list] == ["one", "two"]
+    base.embed_documents.assert_not_called()
+
+
+def test_local_vector_cache_serves_vector_search(store: OpenSearchStore):
+    store.settings.search_mode = "vector"
+    store.settings.local_vector_cache = True
+    dim = store.settings.embedding_dim
+    aligned = {"namespace": ["docs"], "key": "near", "doc": {}, "embedding": [1.0] * dim}
+    orthogonal = {**aligned, "key": "far", "embedding": [1.0, -1.0] * (dim // 2)}
+    store.client.count.return_value = {"count": 2}
+    hits = [{"_id": "docs::far", "_source": orthogonal}, {"_id": "docs::near", "_source": aligned}]
+    shards = {"total": 1, "successful": 1, "skipped": 0}
+    store.client.search.return_value = {
+        "_scroll_id": "s",
+        "_shards": shards,
+        "hits": {"hits": hits},
+    }
+    store.client.scroll.return_value = {"_scroll_id": "s", "_shards": shards, "hits": {"hits": []}}
+
+    first = store.search(("docs",), query="hello", limit=1)
+    second = store.search(("docs",), query="hello", limit=2)
+    assert [item.key for item in first] == ["near"]
+    assert [item.key for item in second] == ["near", "far"]
+    assert second[0].score == pytest.approx(1.0) and second[1].score == pytest.approx(0.5)
+    store.client.search.assert_called_once()  # the scan; no kNN request
+
+    store.put(("docs",), "new", {"text": "fresh"})
+    store.search(("docs",), query="hello", limit=1)
+    assert store.client.search.call_count == 2
+
+
+def test_local_vector_cache_skips_expired_docs_and_honours_their_ttl(store: OpenSearchStore):
+    store.settings.local_vector_cache = True
+    dim = store.settings.embedding_dim
+    expires = datetime.fromtimestamp(datetime.now(UTC).timestamp() + 5, UTC).isoformat()
+    source = {
+        "namespace": ["docs"],
+        "key": "k",
+        "embedding": [1.0] * dim,
+        "ttl_expires_at": expires,
+    }
+    shards = {"total": 1, "successful": 1, "skipped": 0}
+    store.client.count.return_value = {"count": 1}
+    store.client.search.return_value = {
+        "_scroll_id": "s",
+        "_shards": shards,
+        "hits": {"hits": [{"_id": "docs::k", "_source": source}]},
+    }
+    store.client.scroll.return_value = {"_scroll_id": "s", "_shards": shards, "hits": {"hits": []}}
+
+    store._namespace_vectors(("docs",))
+    scan_filters = store.client.search.call_args.kwargs["body"]["query"]["bool"]["filter"]
+    assert any("ttl_expires_at" in json.dumps(clause) for clause in scan_filters)
+    deadline = store._vector_cache["docs"][0]
+    assert deadline - store_module.time.monotonic() <= 5
+
+
+def test_async_ops_offload_to_threads_without_async_client(monkeypatch, store: OpenSearchStore):
+    store.client.get.return_value = {"_source": {"namespace": ["prefs"], "key": "k1", "doc": {}}}
+    item = asyncio.run(store.aget(("prefs",), "k1"))
+    assert item is not None and item.key == "k1"
+    assert store._async_client is None  # the injected sync client served the call
+
+    monkeypatch.setattr(store_module, "async_client_available", lambda: False)
+    bare = OpenSearchStore(settings=store.settings)
+    bare._client = store.client
+    assert asyncio.run(bare.abatch([GetOp(("prefs",), "k1")]))[0].key == "k1"
+    assert bare._async_client is None
+
+
+def test_async_ops_use_async_client(store: OpenSearchStore):
+    async_client = AsyncMock()
+    async_client.index.return_value = {"result": "created"}
+    hit = {
+        "_id": "prefs::user::k1",
+        "_score": 1.0,
+        "_source": {"namespace": ["prefs", "user"], "key": "k1", "doc": {"text": "hi"}},
+    }
+    async_client.msearch.return_value = {
+        "responses": [{"hits": {"hits": [hit]}}, {"hits": {"hits": [hit]}}]
+    }
+    store._async_client = async_client
+
+    async def run():
+        await store.aput(("prefs", "user"), "k1", {"text": "hi"})
+        return await store.asearch(("prefs", "user"), query="what did I say")
+
+    results = asyncio.run(run())
+    async_client.index.assert_awaited_once()
+    assert "embedding" in async_client.index.call_args.kwargs["document"]
+    async_client.update.assert_awaited_once()
+    # Hybrid search sends the BM25 and kNN bodies in one `_msearch`.
+    async_client.msearch.assert_awaited_once()
+    assert [item.key for item in results] == ["k1"]
+    store.client.index.assert_not_called()
+    store.client.search.assert_not_called()
+
+
+def test_hybrid_search_falls_back_to_knn_for_short_queries(store: OpenSearchStore):
+    store.settings.search_mode = "hybrid"
+    store.client.search.return_value = {"hits": {"hits": []}}
+    store.search(("prefs", "user"), query="pizza")
+    store.client.search.assert_called_once()
+    assert "knn" in str(store.client.search.call_args.kwargs["body"]["query"])
+
+    store.client.search.reset_mock()
+    store.settings.hybrid_auto_fallback = False
+    store.client.msearch.return_value = {"responses": [{"hits": {"hits": []}}] * 2}
+    store.search(("prefs", "user"), query="pizza")
+    store.client.search.assert_not_called()
+    store.client.msearch.assert_called_once()
+
+
+def test_search_mmr_prefers_diverse_hits(store: OpenSearchStore):
+    dim = store.settings.embedding_dim
+    half = dim // 2
+
+    def hit(key: str, vector: list[float]) -> dict:
+        source = {"namespace": ["docs"], "key": key, "doc": {"text": key}, "embedding": vector}
+        return {"_id": f"docs::{key}", "_score": 1.0, "_source": source}
+
     store.client.search.return_value = {
         "hits": {
             "hits": [
-                {"_source": {"namespace": ["prefs", "user"]}},
-                {"_source": {"namespace": ["prefs", "other"]}},
+                hit("a", [1.0] * dim),
+                hit("a-copy", [1.0] * (dim - 1) + [0.9]),
+                hit("b", [1.0] * half + [0.0] * (dim - half)),
             ]
         }
     }
-    namespaces = store.list_namespaces(prefix=("prefs",), limit=1)
-    assert namespaces == [("prefs", "other")]
+    results = store.search(("docs",), query="pizza", limit=2, mmr_lambda=0.3)
+    store.client.search.assert_called_once()
+    body = store.client.search.call_args.kwargs["body"]
+    assert body["size"] == 6
+    assert body["_source"] is True
+    assert [item.key for item in results] == ["a", "b"]
+
+
+def test_byte_quantization_encodes_documents_and_queries(store: OpenSearchStore):
+    store.settings.vector_quantization = "byte"
+    store.put(("prefs",), "k1", {"text": "hello"})
+    document = store.client.index.call_args.kwargs["document"]
+    assert document["embedding"] == [127] * store.settings.embedding_dim
+    assert document["embedding_scale"] == pytest.approx(5.0 / 127)
+    body = store._knn_search_body([0.01, -0.04, 0.0], [], 5)
+    assert body["query"]["knn"]["embedding"]["vector"] == [32, -127, 0]
+
+
+def test_embeddings_stay_float32_arrays_with_orjson(store: OpenSearchStore):
+    pytest.importorskip("orjson")
+    from langgraph_opensearch_store.client import _OrjsonSerializer
+
+    store.client.transport.serializer = _OrjsonSerializer()
+    store.put(("prefs",), "k1", {"text": "hello"})
+    stored = store.client.index.call_args.kwargs["document"]["embedding"]
+    assert isinstance(stored, np.ndarray)
+    assert stored.dtype == np.float32
+    assert stored.shape == (store.settings.embedding_dim,)
+
+
+def test_fuse_hits_ranks_shared_docs_first_and_pages(store: OpenSearchStore):
+    text_hits = [{"_id": doc_id} for doc_id in ("a", "b", "c")]
+    vector_hits = [{"_id": doc_id} for doc_id in ("c", "d")]
+    fused = store._fuse_hits(text_hits, vector_hits, limit=2, offset=0)
+    assert [hit["_id"] for hit in fused] == ["c", "a"]
+    paged = store._fuse_hits(text_hits, vector_hits, limit=2, offset=2)
+    assert [hit["_id"] for hit in paged] == ["b", "d"]
+
+
+def test_hybrid_search_embeds_once_and_uses_one_msearch(monkeypatch, store: OpenSearchStore):
+    store.settings.search_mode = "hybrid"
+    # The embeddings instance is shared across the module, so patch it reversibly.
+    monkeypatch.setattr(
+        store._embeddings.base,  # type: ignore[union-attr]
+        "embed_query",
+        MagicMock(return_value=[1.0] * store.settings.embedding_dim),
+    )
+    text_hit = {"_id": "a::k1", "_source": {"namespace": ["a"], "key": "k1", "doc": {}}}
+    knn_hit = {"_id": "a::k2", "_source": {"namespace": ["a"], "key": "k2", "doc": {}}}
+    store.client.msearch.return_value = {
+        "responses": [{"hits": {"hits": [text_hit]}}, {"hits": {"hits": [knn_hit, text_hit]}}]
+    }
+    results = store.search(("a",), query="what do I like to eat")
+    store._embeddings.base.embed_query.assert_called_once()  # type: ignore[union-attr]
+    store.client.search.assert_not_called()
+    lines = store.client.msearch.call_args.kwargs["body"]
+    assert "match" in lines[1]["query"]["bool"]["must"]
+    assert "knn" in lines[3]["query"]
+    assert [item.key for item in results] == ["k1", "k2"]
+
+
+def _namespace_buckets(namespaces: list[list[str]]) -> dict:
+    buckets = [
+        {
+            "key": {"namespace_key": "::".join(ns)},
+            "doc_count": 1,
+            "namespace": {"hits": {"hits": [{"_source": {"namespace": ns}}]}},
+        }
+        for ns in namespaces
+    ]
+    return {"aggregations": {"namespaces": {"buckets": buckets}}}
+
+
+def _composite(call) -> dict:
+    return call.kwargs["body"]["aggs"]["namespaces"]["composite"]
+
+
+def test_list_namespaces_reads_stored_arrays_in_key_order(store: OpenSearchStore):
+    store.client.search.return_value = _namespace_buckets([["a!"], ["a", "b"], ["a::c"]])
+    namespaces = store.list_namespaces(prefix=("a",))
+    assert namespaces == [("a!",), ("a", "b"), ("a::c",)]
+    body = store.client.search.call_args.kwargs["body"]
+    assert body["size"] == 0
+    assert body["query"]["bool"]["filter"] == [{"prefix": {"namespace_key": "a"}}]
+    composite = _composite(store.client.search.call_args)
+    assert composite["size"] == 100 and "after" not in composite
+
+
+def test_list_namespaces_stops_once_the_page_is_filled(store: OpenSearchStore):
+    store.client.search.return_value = _namespace_buckets([["a"], ["b"], ["c"]])
+    assert store.list_namespaces(limit=2, offset=1) == [("b",), ("c",)]
+    store.client.search.assert_called_once()
+    assert _composite(store.client.search.call_args)["size"] == 3
+
+
+def test_list_namespaces_dedupes_truncated_prefixes_across_pages(store: OpenSearchStore):
+    store.client.search.side_effect = [
+        _namespace_buckets([["p", "x", "1"], ["p", "x", "2"]]),
+        _namespace_buckets([["p", "x", "3"], ["p", "y"]]),
+    ]
+    assert store.list_namespaces(max_depth=2, limit=2) == [("p", "x"), ("p", "y")]
+    second_page = _composite(store.client.search.call_args_list[1])
+    assert second_page["after"] == {"namespace_key": "p::x::2"}
+    assert store.client.search.call_count == 2
+
+
+def test_list_namespaces_resumes_the_next_offset_from_its_cursor(store: OpenSearchStore):
+    store.client.search.side_effect = [
+        _namespace_buckets([["p", "x", "1"], ["p", "x", "2"]]),
+        _namespace_buckets([["p", "x", "3"], ["p", "y"]]),
+        _namespace_buckets([["a"], ["b"]]),
+    ]
+    assert store.list_namespaces(max_depth=2, limit=1) == [("p", "x")]
+    # The next page picks up after "p::x::1" and still drops the recurring ("p", "x").
+    assert store.list_namespaces(max_depth=2, limit=1, offset=1) == [("p", "y")]
+    resumed = _composite(store.client.search.call_args_list[1])
+    assert resumed["after"] == {"namespace_key": "p::x::1"} and resumed["size"] == 1
+
+    # Cursors continue one session only: replaying offset 1 re-aggregates from the start.
+    assert store.list_namespaces(limit=1, offset=1) == [("b",)]
+    assert "after" not in _composite(store.client.search.call_args)
+
+
+def test_namespace_writes_invalidate_list_cursors(store: OpenSearchStore):
+    store.client.search.side_effect = [
+        _namespace_buckets([["a"]]),
+        _namespace_buckets([["a"], ["a2"]]),
+    ]
+    store.list_namespaces(limit=1)
+    store.put(("a2",), "k1", {"text": "hello"})
+    assert store.list_namespaces(limit=1, offset=1) == [("a2",)]
+    assert "after" not in _composite(store.client.search.call_args)
 
 
 def test_get_stats_calls_counts(store: OpenSearchStore):
@@ -81,12 +886,13 @@ def test_get_stats_calls_counts(store: OpenSearchStore):
 
 
 def test_put_applies_ttl(store: OpenSearchStore):
-    store._handle_put = OpenSearchStore._handle_put.__get__(store)  # ensure bound? not necessary
     store.put(("prefs",), "k1", {"text": "hello"}, ttl=5)
-    _, kwargs = store.client.index.call_args
-    doc = kwargs["document"]
+    doc = store.client.index.call_args.kwargs["document"]
     assert doc["ttl_minutes"] == 5
-    assert "ttl_expires_at" in doc
+    assert doc["created_at"] == doc["updated_at"]
+    assert doc["created_at"].endswith("+00:00")
+    lifetime = _parse_ts(doc["ttl_expires_at"]) - _parse_ts(doc["created_at"])
+    assert lifetime.total_seconds() == 300
 
 
 def test_get_respects_expired_docs(store: OpenSearchStore):
@@ -99,8 +905,171 @@ def test_get_respects_expired_docs(store: OpenSearchStore):
         "ttl_expires_at": "2000-01-01T00:00:00Z",
     }
     store.client.get.return_value = {"_source": expired_doc}
+    store.client.bulk.return_value = {
+        "errors": False,
+        "items": [{"delete": {"_id": "prefs::k1", "status": 200, "result": "deleted"}}],
+    }
     item = store.get(("prefs",), "k1")
     assert item is None
+    store.client.bulk.assert_called_once()
+
+
+def test_batch_reads_gets_with_one_mget(store: OpenSearchStore):
+    live = {"namespace": ["prefs"], "key": "k1", "doc": {"text": "hi"}}
+    expired = {**live, "key": "k2", "ttl_expires_at": "2000-01-01T00:00:00Z"}
+    store.client.mget.return_value = {
+        "docs": [
+            {"_id": "prefs::k1", "found": True, "_source": live},
+            {"_id": "prefs::k2", "found": True, "_source": expired},
+            {"_id": "prefs::k3", "found": False},
+        ]
+    }
+    store.client.bulk.return_value = {
+        "errors": False,
+        "items": [{"delete": {"_id": "prefs::k2", "status": 200, "result": "deleted"}}],
+    }
+    results = store.batch([GetOp(("prefs",), key) for key in ("k1", "k2", "k3")])
+    assert [item.key if item else None for item in results] == ["k1", None, None]
+    store.client.get.assert_not_called()
+    assert store.client.mget.call_args.kwargs["body"] == {
+        "ids": ["prefs::k1", "prefs::k2", "prefs::k3"]
+    }
+    assert '"delete"' in store.client.bulk.call_args.kwargs["body"]
+    assert _stats_delta(store.client.update) == -1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        NotFoundError(404, "index_not_found_exception", {}),
+        ClusterUnavailable("N/A", "unreachable", OSError()),
+    ],
+    ids=["missing-index", "unreachable"],
+)
+def test_batched_gets_degrade_to_misses_on_transport_errors(store: OpenSearchStore, error):
+    store.client.mget.side_effect = error
+    assert store.batch([GetOp(("prefs",), "k1"), GetOp(("prefs",), "k2")]) == [None, None]
+    async_client = AsyncMock()
+    async_client.mget.side_effect = error
+    store._async_client = async_client
+    ops = [GetOp(("prefs",), "k1"), GetOp(("prefs",), "k2")]
+    assert asyncio.run(store.abatch(ops)) == [None, None]
+
+
+def test_single_get_and_ttl_refresh_degrade_only_on_transport_errors(store: OpenSearchStore):
+    missing = NotFoundError(404, "not_found", {})
+    store.client.get.side_effect = missing
+    assert store.get(("prefs",), "k1") is None
+    async_client = AsyncMock()
+    async_client.get.side_effect = missing
+    store._async_client = async_client
+    assert asyncio.run(store.aget(("prefs",), "k1")) is None
+
+    source = {"ttl_expires_at": "2030-01-01T00:00:00Z", "ttl_minutes": 5}
+    store.client.update.side_effect = ClusterUnavailable("N/A", "unreachable", OSError())
+    store._refresh_ttl("prefs::k1", source)  # best effort: the read still succeeds
+
+    store.client.get.side_effect = TypeError("bad request")
+    with pytest.raises(TypeError):
+        store.get(("prefs",), "k1")
+    async_client.update.side_effect = TypeError("bad request")
+    with pytest.raises(TypeError):
+        asyncio.run(store._a_refresh_ttl("prefs::k1", source))
+
+
+def test_batched_gets_raise_non_transport_errors(store: OpenSearchStore):
+    store.client.mget.side_effect = TypeError("bad request body")
+    with pytest.raises(TypeError):
+        store.batch([GetOp(("prefs",), "k1"), GetOp(("prefs",), "k2")])
+
+
+def test_abatch_reads_gets_with_one_mget(store: OpenSearchStore):
+    async_client = AsyncMock()
+    async_client.mget.return_value = {
+        "docs": [
+            {"_id": "prefs::k1", "found": True, "_source": {"key": "k1", "doc": {}}},
+            {"_id": "prefs::k2", "found": False},
+        ]
+    }
+    store._async_client = async_client
+    results = asyncio.run(store.abatch([GetOp(("prefs",), "k1"), GetOp(("prefs",), "k2")]))
+    assert results[0].key == "k1" and results[1] is None
+    async_client.mget.assert_awaited_once()
+    async_client.get.assert_not_called()
+
+
+def test_parse_ts_handles_stored_and_exotic_timestamps():
+    utc = UTC
+    stored = _parse_ts("2024-01-01T00:00:00.123456+0000")
+    assert stored == datetime(2024, 1, 1, 0, 0, 0, 123456, utc)
+    assert _parse_ts("2024-01-01T00:00:00Z") == datetime(2024, 1, 1, tzinfo=utc)
+    shifted = _parse_ts("2024-01-01T05:00:00,5+05")
+    assert shifted == datetime(2024, 1, 1, 0, 0, 0, 500000, utc)
+    before = datetime.now(utc)
+    assert _parse_ts("not a timestamp") >= before
+
+
+def test_search_purges_expired_hits_with_one_bulk(store: OpenSearchStore):
+    store.settings.search_mode = "text"
+    expired = {"namespace": ["prefs"], "doc": {}, "ttl_expires_at": "2000-01-01T00:00:00Z"}
+    store.client.search.return_value = {
+        "hits": {
+            "hits": [
+                {"_id": "prefs::old1", "_source": {**expired, "key": "old1"}},
+                {"_id": "prefs::old2", "_source": {**expired, "key": "old2"}},
+                {"_id": "prefs::live", "_source": {"namespace": ["prefs"], "key": "live"}},
+            ]
+        }
+    }
+    store.client.bulk.return_value = {
+        "errors": False,
+        "items": [
+            {"delete": {"_id": "prefs::old1", "status": 200, "result": "deleted"}},
+            {"delete": {"_id": "prefs::old2", "status": 404, "result": "not_found"}},
+        ],
+    }
+    items = store.search(("prefs",), query="hello")
+    assert [item.key for item in items] == ["live"]
+    store.client.delete.assert_not_called()
+    store.client.bulk.assert_called_once()
+    assert _stats_delta(store.client.update) == -1
+
+
+def test_search_refreshes_ttls_with_one_bulk(store: OpenSearchStore):
+    store.settings.search_mode = "text"
+    live = {"namespace": ["prefs"], "doc": {}, "ttl_minutes": 5}
+    live["ttl_expires_at"] = "2999-01-01T00:00:00Z"
+    hits = [{"_id": f"prefs::k{i}", "_source": {**live, "key": f"k{i}"}} for i in range(3)]
+    store.client.search.return_value = {"hits": {"hits": hits}}
+    store.client.bulk.return_value = {"errors": False, "items": []}
+    items = store.search(("prefs",), query="hello", refresh_ttl=True)
+    assert len(items) == 3
+    store.client.update.assert_not_called()
+    lines = [json.loads(line) for line in store.client.bulk.call_args.kwargs["body"].splitlines()]
+    assert [header["update"]["_id"] for header in lines[::2]] == [hit["_id"] for hit in hits]
+    assert all("ttl_expires_at" in body["doc"] for body in lines[1::2])
+
+
+def test_is_expired_compares_canonical_timestamps_as_strings(store: OpenSearchStore):
+    now_iso = "2030-06-01T12:00:00.000000+00:00"
+    assert store._is_expired({"ttl_expires_at": "2030-06-01T11:59:59.999999+00:00"}, now_iso)
+    assert not store._is_expired({"ttl_expires_at": "2030-06-01T12:00:00.000001+00:00"}, now_iso)
+    # Legacy layouts still go through the parser.
+    assert store._is_expired({"ttl_expires_at": "2030-06-01T13:00:00.000000+0200"}, now_iso)
+    assert not store._is_expired({"ttl_expires_at": "2030-06-01T12:30:00Z"}, now_iso)
+    assert not store._is_expired({}, now_iso)
+
+
+def test_op_timing_is_skipped_without_metrics_or_logging(store: OpenSearchStore):
+    store._record_operation = MagicMock()  # type: ignore[method-assign]
+    store.client.get.return_value = {"_source": {"key": "k1", "doc": {}}}
+    store.get(("prefs",), "k1")
+    store._record_operation.assert_called_once()
+
+    store.settings.log_operations = False
+    store.get(("prefs",), "k1")
+    store._record_operation.assert_called_once()
+    assert store._metrics.record.__name__ == "_discard_metric"
 
 
 def test_ttl_manager_delete_query(store: OpenSearchStore):
@@ -143,39 +1112,34 @@ def test_migrate_invokes_template_manager(monkeypatch, store: OpenSearchStore):
     assert result == {"rolled_over": True, "new_index": "custom"}
 
 
-def test_create_snapshot_calls_client(store: OpenSearchStore):
-    store.client.snapshot.create.return_value = {"accepted": True}
-    result = store.create_snapshot(
-        repository="repo",
-        snapshot="snap",
-        indices=["a", "b"],
-        wait=False,
-        metadata={"source": "test"},
-    )
-    store.client.snapshot.create.assert_called_with(
-        repository="repo",
-        snapshot="snap",
-        body={"indices": "a,b", "metadata": {"source": "test"}},
-        wait_for_completion=False,
-    )
-    assert result == {"accepted": True}
-
-
-def test_restore_snapshot_calls_client(store: OpenSearchStore):
-    store.client.snapshot.restore.return_value = {"accepted": True}
-    store.restore_snapshot(repository="repo", snapshot="snap", indices=["a"], wait=True)
-    store.client.snapshot.restore.assert_called_with(
-        repository="repo",
-        snapshot="snap",
-        body={"indices": "a"},
-        wait_for_completion=True,
-    )
-
-
-def test_delete_snapshot_calls_client(store: OpenSearchStore):
-    store.client.snapshot.delete.return_value = {"acknowledged": True}
-    store.delete_snapshot(repository="repo", snapshot="snap")
-    store.client.snapshot.delete.assert_called_with(repository="repo", snapshot="snap")
+@pytest.mark.parametrize(
+    ("op", "args", "expected"),
+    [
+        (
+            "create",
+            {"indices": ["a", "b"], "wait": False, "metadata": {"source": "test"}},
+            {
+                "body": {"indices": "a,b", "metadata": {"source": "test"}},
+                "wait_for_completion": False,
+            },
+        ),
+        (
+            "restore",
+            {"indices": ["a"], "wait": True},
+            {"body": {"indices": "a"}, "wait_for_completion": True},
+        ),
+        ("delete", {}, {}),
+    ],
+    ids=["create", "restore", "delete"],
+)
+def test_snapshot_ops_call_client(
+    store: OpenSearchStore, op: str, args: dict[str, object], expected: dict[str, object]
+):
+    client_method = getattr(store.client.snapshot, op)
+    client_method.return_value = {"acknowledged": True}
+    result = getattr(store, f"{op}_snapshot")(repository="repo", snapshot="snap", **args)
+    client_method.assert_called_once_with(repository="repo", snapshot="snap", **expected)
+    assert result == {"acknowledged": True}
 
 
 def _extract_knn_clause(store: OpenSearchStore, body: dict[str, object]) -> dict[str, object]:
@@ -188,23 +1152,49 @@ def _extract_knn_clause(store: OpenSearchStore, body: dict[str, object]) -> dict
     return clause
 
 
-def test_apply_knn_query_builds_expected_structure(store: OpenSearchStore):
+@pytest.mark.parametrize(
+    ("knn_params", "expected_ef_search"),
+    [
+        ({"k": 3, "num_candidates": 500}, 500),
+        ({"k": 300, "num_candidates": 1}, 300),  # max(k, num_candidates)
+        ({"k": 3, "num_candidates": 9}, None),  # settings.hnsw_ef_search is the floor
+        ({"k": 5}, None),
+    ],
+    ids=["num-candidates", "k-floor", "settings-floor", "settings-default"],
+)
+def test_apply_knn_query_sets_ef_search(
+    store: OpenSearchStore, knn_params: dict[str, int], expected_ef_search: int | None
+):
     body: dict[str, object] = {}
-    vector = [0.5] * store.settings.embedding_dim
-    store._apply_knn_query(body, {"vector": vector, "k": 3, "num_candidates": 9}, [])
+    store._apply_knn_query(body, {"vector": VECTOR, **knn_params}, [])
     clause = _extract_knn_clause(store, body)
-    assert clause["vector"] == vector
-    assert clause["k"] == 3
+    assert clause["vector"] == VECTOR
+    assert clause["k"] == knn_params["k"]
+    assert "num_candidates" not in clause
     method_params = clause.get("method_parameters")
     assert isinstance(method_params, dict)
-    assert method_params.get("ef_search") == 9
+    if expected_ef_search is None:
+        expected_ef_search = store.settings.hnsw_ef_search
+    assert method_params.get("ef_search") == expected_ef_search
+
+
+def test_vector_search_uses_ef_search_setting_as_floor(store: OpenSearchStore):
+    store.settings.search_mode = "vector"
+    store.client.search.return_value = {"hits": {"hits": []}}
+    for ef_search in (100, 500):
+        store.settings.hnsw_ef_search = ef_search
+        store.search(("prefs",), query="hello", limit=2)
+        body = store.client.search.call_args.kwargs["body"]
+        clause = _extract_knn_clause(store, body)
+        assert clause["method_parameters"]["ef_search"] == max(
+            ef_search, store.settings.search_num_candidates
+        )
 
 
 def test_apply_knn_query_embeds_filters_inline(store: OpenSearchStore):
     body: dict[str, object] = {}
     filters = [{"term": {"namespace_key": "prefs::user"}}]
-    vector = [0.1] * store.settings.embedding_dim
-    store._apply_knn_query(body, {"vector": vector, "k": 1}, list(filters))
+    store._apply_knn_query(body, {"vector": VECTOR, "k": 1}, list(filters))
     clause = _extract_knn_clause(store, body)
     filter_clause = clause.get("filter")
     assert isinstance(filter_clause, dict)
@@ -214,14 +1204,3 @@ def test_apply_knn_query_embeds_filters_inline(store: OpenSearchStore):
     assigned = bool_block.get("filter")
     assert isinstance(assigned, list)
     assert filters[0] in assigned
-
-
-def test_knn_clause_converts_num_candidates_to_method_params(store: OpenSearchStore):
-    body: dict[str, object] = {}
-    vector = [0.2] * store.settings.embedding_dim
-    store._apply_knn_query(body, {"vector": vector, "k": 2, "num_candidates": 1}, [])
-    clause = _extract_knn_clause(store, body)
-    assert "num_candidates" not in clause
-    method_params = clause.get("method_parameters")
-    assert isinstance(method_params, dict)
-    assert method_params.get("ef_search") == 2  # max(k, num_candidates)
@@ -1,15 +1,17 @@
 from unittest.mock import MagicMock
 
+import pytest
+from opensearchpy import TransportError
+
 from langgraph_opensearch_store.config import Settings
-from langgraph_opensearch_store.schema import TemplateManager
+from langgraph_opensearch_store.schema import TemplateManager, data_index_template
 
 
-def test_template_manager_apply_creates_indices():
+def test_template_manager_apply_creates_indices(default_settings: Settings):
     client = MagicMock()
-    client.indices = MagicMock()
     client.indices.exists.return_value = False
 
-    settings = Settings(hosts="http://localhost:9200")
+    settings = default_settings.model_copy()
     manager = TemplateManager(client, settings)
     manager.apply()
 
@@ -22,15 +24,36 @@ def test_template_manager_apply_creates_indices():
         name=settings.data_index_alias,
         ignore=[404],
     )
+    client.put_script.assert_called_once()
+    assert client.put_script.call_args.kwargs["id"] == f"{settings.index_prefix}-ns_stats_upsert"
+    client.search.assert_called_once()
+    warmup = client.search.call_args.kwargs
+    assert warmup["index"] == settings.data_index_alias
+    assert warmup["body"]["query"]["knn"]["embedding"]["k"] == 1
+
+    client.search.reset_mock()
+    settings.warmup_on_setup = False
+    manager.apply()
+    client.search.assert_not_called()
+
 
+def test_warmup_failures_are_logged_not_raised(default_settings: Settings):
+    client = MagicMock()
+    client.search.side_effect = TransportError(503, "unavailable", {})
+    manager = TemplateManager(client, default_settings.model_copy())
+    manager._warm_vector_graphs()
+
+    client.search.side_effect = TypeError("bad body")
+    with pytest.raises(TypeError):
+        manager._warm_vector_graphs()
 
-def test_template_manager_upgrade_rollover():
+
+def test_template_manager_upgrade_rollover(default_settings: Settings):
     client = MagicMock()
-    client.indices = MagicMock()
     client.indices.exists.return_value = True
     client.indices.rollover.return_value = {"rolled_over": True, "new_index": "custom"}
 
-    settings = Settings(hosts="http://localhost:9200")
+    settings = default_settings
     manager = TemplateManager(client, settings)
 
     result = manager.upgrade(rollover=True, new_index="custom")
@@ -45,15 +68,41 @@ def test_template_manager_upgrade_rollover():
     assert result == {"rolled_over": True, "new_index": "custom"}
 
 
-def test_template_manager_upgrade_without_rollover():
+def test_template_manager_upgrade_without_rollover(default_settings: Settings):
     client = MagicMock()
-    client.indices = MagicMock()
     client.indices.exists.return_value = True
 
-    settings = Settings(hosts="http://localhost:9200")
+    settings = default_settings
     manager = TemplateManager(client, settings)
 
     result = manager.upgrade(rollover=False)
 
     client.indices.rollover.assert_not_called()
     assert result == {"rolled_over": False, "new_index": None}
+
+
+def test_template_manager_skips_stored_scripts_on_serverless(default_settings: Settings):
+    client = MagicMock()
+    client.indices.exists.return_value = True
+    settings = default_settings.model_copy(update={"aws_service": "aoss", "warmup_on_setup": False})
+    TemplateManager(client, settings).apply()
+    client.put_script.assert_not_called()
+
+
+def test_data_index_template_sets_hnsw_parameters(default_settings: Settings):
+    settings = default_settings.model_copy(update={"hnsw_m": 32, "hnsw_ef_construction": 256})
+    mapping = data_index_template(settings)["template"]["mappings"]["properties"]["embedding"]
+    assert mapping["method"]["parameters"] == {"m": 32, "ef_construction": 256}
+    assert "data_type" not in mapping
+
+    settings = default_settings.model_copy(update={"vector_quantization": "byte"})
+    mapping = data_index_template(settings)["template"]["mappings"]["properties"]["embedding"]
+    assert mapping["data_type"] == "byte"
+
+
+def test_data_index_template_tunes_write_path(default_settings: Settings):
+    settings = default_settings.model_copy(update={"index_refresh_interval": "30s"})
+    index_settings = data_index_template(settings)["template"]["settings"]["index"]
+    assert index_settings["refresh_interval"] == "30s"
+    assert index_settings["translog"] == {"flush_threshold_size": "1gb"}
+    assert index_settings["number_of_replicas"] == 1